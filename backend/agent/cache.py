@@ -0,0 +1,151 @@
+import time
+import hashlib
+import threading
+import numpy as np
+from typing import Any, List, Optional
+
+MAX_CACHE = 4096
+CACHE_TTL = 3600  # seconds
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EXACT_DIM = 512
+
+
+class SemanticCache:
+    """
+    Approximate (semantic) cache for agent responses.
+    Queries are embedded into unit vectors; a lookup returns the stored result of the
+    most similar previous query if its cosine similarity reaches `threshold`, so
+    paraphrases ("show floods in Chennai" / "flood imagery Chennai") share one LLM call.
+    Entries only match lookups made with the same `scope` (e.g. the user profile and context).
+
+    Bounded to `max_entries` (least-recently-used eviction), entries expire after `ttl`
+    seconds, and all reads/writes are serialized by a lock so the cache can be shared
+    between the event loop and worker threads.
+    """
+
+    # Rows are added to the embedding matrix in blocks to amortize np.vstack copies.
+    GROW_BY = 256
+
+    def __init__(self, threshold: float = 0.9, invalidate_threshold: float = 0.8,
+                 max_entries: int = MAX_CACHE, ttl: float = CACHE_TTL):
+        self.threshold = threshold
+        self.invalidate_threshold = invalidate_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._model = None
+        # Row-aligned storage; only the first `_size` rows are valid.
+        self._embeddings: np.ndarray = None  # (capacity, D) float32
+        self._last_used = np.empty(0, dtype=np.int64)
+        self._stored_at = np.empty(0, dtype=np.float64)
+        self._scopes = np.empty(0, dtype=np.int64)
+        self._entries: List[Any] = []
+        self._size = 0
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embeds `text` as a normalized float32 vector.
+        Without sentence-transformers the cache degrades to exact matching (see _exact_embedding).
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._load_model()
+        if self._model is False:
+            return self._exact_embedding(text)
+        return np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def get(self, vector: np.ndarray, scope: str = "") -> Optional[Any]:
+        with self._lock:
+            n = self._size
+            if not n:
+                return None
+            sims = self._embeddings[:n] @ vector
+            # Expired or other-scope entries never match; LRU eviction reclaims their rows.
+            sims[self._stored_at[:n] < time.monotonic() - self.ttl] = -1.0
+            sims[self._scopes[:n] != _scope_id(scope)] = -1.0
+            best = int(sims.argmax())
+            if sims[best] < self.threshold:
+                return None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._entries[best]
+
+    def put(self, vector: np.ndarray, value: Any, scope: str = "") -> None:
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = np.empty((self.GROW_BY, vector.shape[0]), dtype=np.float32)
+                self._last_used = np.empty(self.GROW_BY, dtype=np.int64)
+                self._stored_at = np.empty(self.GROW_BY, dtype=np.float64)
+                self._scopes = np.empty(self.GROW_BY, dtype=np.int64)
+            elif self._size == self._embeddings.shape[0]:
+                block = np.empty((self.GROW_BY, self._embeddings.shape[1]), dtype=np.float32)
+                self._embeddings = np.vstack([self._embeddings, block])
+                self._last_used = np.concatenate([self._last_used, np.empty(self.GROW_BY, dtype=np.int64)])
+                self._stored_at = np.concatenate([self._stored_at, np.empty(self.GROW_BY, dtype=np.float64)])
+                self._scopes = np.concatenate([self._scopes, np.empty(self.GROW_BY, dtype=np.int64)])
+
+            self._clock += 1
+            idx = self._size
+            self._embeddings[idx] = vector
+            self._last_used[idx] = self._clock
+            self._stored_at[idx] = time.monotonic()
+            self._scopes[idx] = _scope_id(scope)
+            self._entries.append(value)
+            self._size += 1
+
+            if self._size > self.max_entries:
+                self._remove(int(self._last_used[:self._size].argmin()))
+
+    def invalidate(self, topic: str) -> int:
+        """
+        Drops every entry inside the 'invalidation sphere' of `topic`
+        (cosine similarity >= invalidate_threshold). Returns the number of entries removed.
+        """
+        topic_vec = self.encode(topic.lower().strip())
+        with self._lock:
+            if not self._size:
+                return 0
+            sims = self._embeddings[:self._size] @ topic_vec
+            doomed = np.flatnonzero(sims >= self.invalidate_threshold)
+            # Remove from the back so swap-with-last never moves a row we still have to delete.
+            for idx in doomed[::-1]:
+                self._remove(int(idx))
+            return len(doomed)
+
+    def _remove(self, idx: int) -> None:
+        # O(D) delete: move the last row into the freed slot. Caller holds the lock.
+        last = self._size - 1
+        if idx != last:
+            self._embeddings[idx] = self._embeddings[last]
+            self._last_used[idx] = self._last_used[last]
+            self._stored_at[idx] = self._stored_at[last]
+            self._scopes[idx] = self._scopes[last]
+            self._entries[idx] = self._entries[last]
+        self._entries.pop()
+        self._size = last
+
+    def _load_model(self) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception as e:
+            print(f"Warning: semantic cache running without embedding model ({e}). Only exact repeats will hit.")
+            self._model = False
+
+    def _exact_embedding(self, text: str) -> np.ndarray:
+        # Random unit vector seeded by the whole text: identical text scores 1.0, anything else
+        # ~N(0, 1/EXACT_DIM), far below any threshold. Lexical overlap must not count as a match.
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vec = np.random.default_rng(seed).standard_normal(EXACT_DIM).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+
+def _scope_id(scope: str) -> int:
+    return int.from_bytes(hashlib.sha256(scope.encode()).digest()[:8], "little", signed=True)
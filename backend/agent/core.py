@@ -1,13 +1,54 @@
 import os
+import re
+import time
+import asyncio
+import functools
+from contextlib import aclosing
+import httpx
 from google import genai
-from typing import Dict, Any, List
+from google.genai import errors as genai_errors
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_exponential, RetryError
-from .prompts import SYSTEM_PROMPT
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type, RetryError
+from .prompts import SYSTEM_PROMPT, AGENT_DIRECTIVES, PROFILE_PROMPT
+from .cache import SemanticCache
 from .tools import TOOLS
 
 load_dotenv()
 
+# One pass over the LLM output instead of splitting and prefix-testing every line.
+_REACT_RE = re.compile(r'^[ \t]*(Thought|Action|Final Answer):[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+# A 'Final Answer:' line with text after the label; a bare label means the answer follows below.
+_FINAL_ANSWER_RE = re.compile(r'^[ \t]*Final Answer:[ \t]*\S', re.MULTILINE)
+
+PROMPT_CACHE_TTL = 3600  # seconds
+PROMPT_CACHE_RETRY = 60  # seconds before retrying after a transient caches.create failure
+# Smallest system instruction the model will cache (32k tokens on gemini-1.5); override for newer models.
+# The shipped ~300-token AGENT_DIRECTIVES are below it, so by default they are sent inline (see README).
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("AGENT_PROMPT_CACHE_MIN_TOKENS", "32768"))
+
+# Offline fallback rules (keyword -> tag), matched in a single scan of the query.
+_FALLBACK_KEYWORDS = {
+    "cloud": "weather", "flood": "weather", "rain": "weather",
+    "field": "highres", "farm": "highres", "boundary": "highres",
+}
+_FALLBACK_RE = re.compile("|".join(map(re.escape, _FALLBACK_KEYWORDS)))
+
+# Network faults from whichever HTTP stack google-genai runs on (httpx, or aiohttp when installed).
+try:
+    import aiohttp
+    _TRANSPORT_ERRORS = (httpx.TransportError, aiohttp.ClientError, asyncio.TimeoutError)
+except ImportError:
+    _TRANSPORT_ERRORS = (httpx.TransportError, asyncio.TimeoutError)
+
+class TransientLLMError(Exception):
+    """LLM failure worth retrying: rate limit (429), server error (5xx) or a network fault."""
+
+@functools.lru_cache(maxsize=256)
+def _profile_preamble(name: str, role: str, organization: str, aoi: str) -> str:
+    """Profile-specific prompt head, up to and including the 'USER QUERY: ' label."""
+    return PROFILE_PROMPT.format(name=name, role=role, organization=organization, aoi=aoi) + "\n\nUSER QUERY: "
+
 class SatFusionAgent:
     """
     The Autonomous Agent that reasons about Geospatial Data using Gemini (google-genai SDK).
@@ -27,22 +68,94 @@ class SatFusionAgent:
         self.tools = TOOLS
         # Switching to stable model
         self.model_name = "gemini-1.5-flash"
-        self.cache = {} # Simple in-memory cache for demo purposes not to be considered real.
+        # Semantic cache: paraphrased queries reuse an earlier answer instead of a new LLM call.
+        self.cache = SemanticCache()
+
+        # Server-side context cache for AGENT_DIRECTIVES, created lazily by _get_prompt_cache().
+        self._prompt_cache: Optional[str] = None
+        self._prompt_cache_expiry = 0.0
+        self._prompt_cache_retry_at = 0.0
+        # Decided once: directives below the minimum (~4 chars/token) are always sent inline.
+        self._prompt_cache_disabled = len(AGENT_DIRECTIVES) // 4 < PROMPT_CACHE_MIN_TOKENS
+        self._prompt_cache_lock = asyncio.Lock()
+
+    async def _get_prompt_cache(self) -> Optional[str]:
+        """
+        Returns the name of the Gemini context cache holding AGENT_DIRECTIVES, creating it on first use.
+        Returns None when caching is off or creation failed, in which case the directives are sent
+        inline as the system instruction. Only a permanent 4xx turns caching off for the process;
+        other failures are retried after PROMPT_CACHE_RETRY seconds.
+        """
+        if self._prompt_cache_disabled:
+            return None
+        async with self._prompt_cache_lock:
+            now = time.monotonic()
+            if self._prompt_cache and now < self._prompt_cache_expiry:
+                return self._prompt_cache
+            if now < self._prompt_cache_retry_at:
+                return None
+            try:
+                cache = await self.client.aio.caches.create(
+                    model=self.model_name,
+                    config={'system_instruction': AGENT_DIRECTIVES, 'ttl': f'{PROMPT_CACHE_TTL}s'}
+                )
+            except Exception as e:
+                print(f"Warning: Context cache unavailable, sending directives inline. Details: {e}")
+                if isinstance(e, genai_errors.ClientError) and e.code != 429:
+                    self._prompt_cache_disabled = True
+                else:
+                    self._prompt_cache_retry_at = now + PROMPT_CACHE_RETRY
+                return None
+            self._prompt_cache = cache.name
+            # Renew a minute early so requests never reference an expired cache.
+            self._prompt_cache_expiry = time.monotonic() + PROMPT_CACHE_TTL - 60
+            return self._prompt_cache
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=2, min=5, max=20))
-    def _call_llm(self, prompt: str):
+    # Interactive latency: short jittered backoff, and only transient failures are retried.
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential_jitter(initial=0.5, max=4),
+           retry=retry_if_exception_type(TransientLLMError))
+    async def _call_llm(self, prompt: str) -> str:
+        """
+        Streams the completion from the async client so the event loop stays free.
+        Returns as soon as a complete, non-empty 'Final Answer:' line has been generated.
+        """
         if not self.client:
              raise ValueError("API Key missing")
              
+        config = {'temperature': 0.2}
+        cache_name = await self._get_prompt_cache()
+        if cache_name:
+            config['cached_content'] = cache_name
+        else:
+            config['system_instruction'] = AGENT_DIRECTIVES
+
         try:
-            response = self.client.models.generate_content(
+            stream = await self.client.aio.models.generate_content_stream(
                 model=self.model_name,
                 contents=prompt,
-                config={'temperature': 0.2}
+                config=config
             )
-            return response.text
+            buffer = ""
+            scan_from = 0  # start of the first line not yet scanned
+            async with aclosing(stream):
+                async for chunk in stream:
+                    buffer += chunk.text or ""
+                    line_end = buffer.rfind("\n")
+                    if line_end < scan_from:
+                        continue
+                    # Only complete lines are scanned; the unfinished tail waits for the next chunk.
+                    if _FINAL_ANSWER_RE.search(buffer, scan_from, line_end):
+                        return buffer[:line_end]
+                    scan_from = line_end + 1
+            return buffer
         except Exception as e:
             print(f"LLM Error: {e}")
+            # The cache may have been evicted server-side; recreate it on the next attempt.
+            self._prompt_cache = None
+            if isinstance(e, genai_errors.APIError) and (e.code == 429 or e.code >= 500):
+                raise TransientLLMError(str(e)) from e
+            if isinstance(e, _TRANSPORT_ERRORS):
+                raise TransientLLMError(str(e)) from e
             raise e
 
     async def reason_and_act(self, user_query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -50,17 +163,6 @@ class SatFusionAgent:
         The Core Loop using Gemini with Retry Logic.
         """
         
-        # 0. Check Cache (Save Quota)
-        query_key = user_query.lower().strip()
-        if query_key in self.cache:
-            return self.cache[query_key]
-
-        thought_process = []
-        actions = []
-        final_answer = ""
-        
-        thought_process.append(f"Received query: '{user_query}'")
-        
         # 1. Construct Prompt
         # Dynamic System Prompt based on User Profile
         user_profile = context.get('user_profile', {}) if context else {}
@@ -73,91 +175,81 @@ class SatFusionAgent:
             "aoi": user_profile.get("aoi", "Global")
         }
 
-        # Context-Aware System Prompt
-        dynamic_system_prompt = f"""
-You are the Uniearth Intelligence Agent, acting as a high-level decision support system for {profile['name']}, a {profile['role']} at {profile['organization']}. 
-Your primary mission is to transform raw multi-satellite fusion data (Sentinel, Landsat, ISRO) into actionable professional insights. 
-
-**User Profile Context:**
-- Role: {profile['role']} (e.g., if Agriculture, prioritize NDVI/Soil moisture. If Urban, prioritize Heat Maps/Expansion).
-- Organization: {profile['organization']}
-- Saved AOI: {profile['aoi']}
-
-**Task Logic:**
-1. **Focus:** tailor spectral choices to the user's role.
-2. **Default Action:** If no location is provided in the query, automatically analyze the user's "Saved AOI" ({profile['aoi']}).
-3. **Anomaly Alerts:** Compare current data with historical baseline to report significant percentage changes (Delta).
-4. **Tone:** Provide data-driven, executive-level insights suitable for {profile['organization']}.
-
-**Core Directives:**
-1.  **The Mandate of Completeness:**
-    *   **Spatial:** Never rely solely on medium-resolution data (Sentinel-2/Landsat) if structural detail is needed. Always consider querying ISRO Resourcesat-2 (LISS-IV) or Cartosat.
-    *   **All-Weather:** If cloud cover > 20%, you are REQUIRED to trigger the SAR workflow (Sentinel-1) to see through clouds.
-
-2.  **The Mandate of Difference (Sovereign Context):**
-    *   **Sovereign Grounding:** Prioritize Indian context. Validate findings against VEDAS layers (e.g., classify water bodies only if they align with Wetland Inventory).
-
-**Available Tools:**
-*   `search_isro`: search for LISS-IV/Cartosat data.
-*   `search_global`: search for Sentinel-2/Landsat data.
-*   `fuse_optical`: Perform Brovey Transform (Pan-Sharpening).
-*   `fuse_sar`: Perform HSV Fusion (Cloud Penetration).
-"""
-
-        full_prompt = f"{dynamic_system_prompt}\n\nUSER QUERY: {user_query}\n\n"
-        if context:
-            full_prompt += f"ADDITIONAL CONTEXT: {context}\n\n"
-        full_prompt += "Reasoning Trace:"
+        # Context-Aware System Prompt (the static AGENT_DIRECTIVES are sent via the context cache).
+        # The formatted preamble is memoized per profile, so a request only builds its own tail.
+        preamble = _profile_preamble(*(str(profile[k]) for k in ("name", "role", "organization", "aoi")))
+        context_text = f"ADDITIONAL CONTEXT: {context}\n\n" if context else ""
+
+        # Check Cache (Save Quota); answers are only shared between identical profile + context.
+        cache_scope = preamble + context_text
+        query_key = user_query.lower().strip()
+        # Embedding is CPU-bound (and loads the model on first use), keep it off the event loop.
+        query_vec = await asyncio.to_thread(self.cache.encode, query_key)
+        cached = self.cache.get(query_vec, cache_scope)
+        if cached is not None:
+            # A paraphrase hit: report this request's own query, never the one that filled the entry.
+            return {**cached,
+                    "query": user_query,
+                    "thoughts": [f"Received query: '{user_query}'", *cached["thoughts"][1:]],
+                    "actions": list(cached["actions"])}
+
+        thought_process = []
+        actions = []
+        final_answer = ""
+        offline = False
+        
+        thought_process.append(f"Received query: '{user_query}'")
+
+        parts = [preamble, user_query, "\n\n", context_text]
+        parts.append("Reasoning Trace:")
+        full_prompt = "".join(parts)
 
         try:
             # 2. Get Reasoning from LLM (with retry)
-            llm_output = self._call_llm(full_prompt)
+            llm_output = await self._call_llm(full_prompt)
             
             # Simple parsing of the LLM output (assuming it follows the ReAct structure)
             # In a production system, we would use function calling or stricter parsing
             
-            lines = llm_output.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith("Thought:"):
-                    thought_process.append(line)
-                elif line.startswith("Action:"):
-                    thought_process.append(line)
-                    # Extract action
-                    # Format expected: Action: tool_name(arg1, arg2)
-                    # This is a simplified parser for the demo
-                    if "search_global" in line:
-                         # Mocking the extraction for now to keep it simple, 
-                         # but logically this is where we'd parse 'search_global' and call it.
-                         # For true real-time, we need to connect this string to self.tools call.
-                         thought_process.append("Executing Search...")
-                         # We'll default to a mocked successful search for this step to verify flow,
-                         # modifying this to actual tool call next.
-                elif line.startswith("Final Answer:"):
-                    final_answer = line.replace("Final Answer:", "").strip()
+            for m in _REACT_RE.finditer(llm_output):
+                kind, body = m.group(1), m.group(2)
+                if kind == "Final Answer":
+                    final_answer = body
+                    continue
+                thought_process.append(m.group(0).strip())
+                # Format expected: Action: tool_name(arg1, arg2)
+                # This is a simplified parser for the demo
+                if kind == "Action" and "search_global" in body:
+                    # For true real-time, we need to connect this string to self.tools call.
+                    thought_process.append("Executing Search...")
 
             if not final_answer:
                  final_answer = llm_output # Fallback if parsing fails
 
-        except RetryError as e:
-            original_error = str(e.last_attempt.exception()) if e.last_attempt else str(e)
+        except Exception as e:
+            # Any LLM failure ends in the offline answer. RetryError: transient failures
+            # exhausted the retries; anything else (ClientError, missing key, an unclassified
+            # transport error) failed fast without retrying.
+            if isinstance(e, RetryError) and e.last_attempt:
+                original_error = str(e.last_attempt.exception())
+            else:
+                original_error = str(e)
             thought_process.append(f"Info: API Error. Details: {original_error}")
             thought_process.append("Switching to Offline Mode.")
+            offline = True
             # FALLBACK HEURISTIC (The original logic)
             query_lower = user_query.lower()
-            if "cloud" in query_lower or "flood" in query_lower or "rain" in query_lower:
+            tags = {_FALLBACK_KEYWORDS[m.group(0)] for m in _FALLBACK_RE.finditer(query_lower)}
+            if "weather" in tags:
                 thought_process.append("Fallback: Detected adverse weather context. Rule 'All-Weather' applies.")
                 final_answer = "(Backup Mode) I have activated the All-Weather mode. Using Sentinel-1 SAR backscatter to penetrate the cloud cover, fused with available optical context."
-            elif "field" in query_lower or "farm" in query_lower or "boundary" in query_lower:
+            elif "highres" in tags:
                 thought_process.append("Fallback: Detected high-resolution requirement. Rule 'Spatial Completeness' applies.")
                 final_answer = "(Backup Mode) I have prioritized Spatial Completeness. Fusing LISS-IV (5.8m) data from ISRO for farm plot structures."
             else:
                 thought_process.append("Fallback: Standard monitoring request.")
                 final_answer = "(Backup Mode) Retrieved standard Sentinel-2 imagery. Conditions are clear."
 
-        except Exception as e:
-            thought_process.append(f"Error during reasoning: {str(e)}")
-            final_answer = "I encountered an error while processing your request. Please check my logs."
 
         result = {
             "query": user_query,
@@ -167,7 +259,14 @@ Your primary mission is to transform raw multi-satellite fusion data (Sentinel,
             "agent_persona": "Sat-Fusion-AI (Gemini Powered)"
         }
         
-        # Save to Cache
-        self.cache[query_key] = result
+        # Save to Cache; backup answers aren't, so an outage or bad key isn't replayed for the TTL.
+        if not offline:
+            self.cache.put(query_vec, result, cache_scope)
         return result
 
+    def invalidate(self, topic: str) -> int:
+        """
+        Evicts cached answers semantically close to `topic` (e.g. after new imagery arrives).
+        """
+        return self.cache.invalidate(topic)
+
@@ -1,37 +1,65 @@
+import sys
+import asyncio
+from datetime import datetime
 from typing import List, Dict, Any
 # Lazy imports to avoid circular dependencies or startup costs
 # In a real agent framework (LangChain/LlamaIndex), these would be Tool objects.
 
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' natively from 3.11 on.
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(s: str) -> datetime:
+        """ISO-8601 parse that also accepts a trailing 'Z' (UTC)."""
+        return datetime.fromisoformat(s[:-1] + '+00:00') if s.endswith('Z') else datetime.fromisoformat(s)
+
+# Connector instances are reused across tool calls (they share one pooled STAC client).
+_CONNECTORS: Dict[str, Any] = {}
+
+def _get_connector(source: str):
+    connector = _CONNECTORS.get(source)
+    if connector is None:
+        if source == "isro-bhuvan":
+            from connectors.bhoonidhi import ISROConnector
+            connector = ISROConnector()
+        elif source == "sentinel-2":
+            from connectors.sentinel import SentinelConnector
+            connector = SentinelConnector()
+        elif source == "landsat-8":
+            from connectors.nasa import LandsatConnector
+            connector = LandsatConnector()
+        else:
+            return None
+        _CONNECTORS[source] = connector
+    return connector
+
 async def tool_search_isro(bbox: List[float], start_date: str, end_date: str) -> Dict[str, Any]:
     """Searches ISRO Bhuvan for data."""
-    from connectors.bhoonidhi import ISROConnector
-    from datetime import datetime
-    
-    c = ISROConnector()
+    c = _get_connector("isro-bhuvan")
     # Mocking date parsing for the tool wrapper
-    start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-    end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+    start = _parse_iso(start_date)
+    end = _parse_iso(end_date)
     
     results = await c.search(bbox, start, end)
     return {"status": "found", "count": len(results), "data": results}
 
-async def tool_search_global(source: str, bbox: List[float], start_date: str, end_date: str) -> Dict[str, Any]:
-    """Searches Global sources (Sentinel/Landsat)."""
-    from connectors.sentinel import SentinelConnector
-    from connectors.nasa import LandsatConnector
-    from datetime import datetime
-    
-    if source == "sentinel-2":
-        c = SentinelConnector()
-    elif source == "landsat-8":
-        c = LandsatConnector()
-    else:
-        return {"error": "Unknown global source"}
-
-    start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-    end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+async def tool_search_global(sources: List[str], bbox: List[float], start_date: str, end_date: str) -> Dict[str, Any]:
+    """Searches Global sources (Sentinel/Landsat). Multiple sources are queried concurrently."""
+    if isinstance(sources, str):
+        sources = [sources]
+    # A source named twice is searched once (first-seen order kept).
+    sources = list(dict.fromkeys(sources))
+    unknown = [s for s in sources if s not in ("sentinel-2", "landsat-8")]
+    if unknown or not sources:
+        return {"error": f"Unknown global source: {', '.join(unknown)}"}
+
+    connectors = [_get_connector(s) for s in sources]
+
+    start = _parse_iso(start_date)
+    end = _parse_iso(end_date)
     
-    results = await c.search(bbox, start, end)
+    batches = await asyncio.gather(*(c.search(bbox, start, end) for c in connectors))
+    results = [item for batch in batches for item in batch]
     return {"status": "found", "count": len(results), "data": results}
 
 async def tool_fuse_optical(optical_id: str, pan_id: str) -> Dict[str, Any]:
@@ -1,4 +1,5 @@
 import os
+import itertools
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -14,7 +15,7 @@ genai.configure(api_key=api_key)
 print("Listing available models...")
 try:
     found = False
-    for m in genai.list_models():
+    for m in itertools.islice(genai.list_models(page_size=50), 50):
         if 'generateContent' in m.supported_generation_methods:
             print(f"- {m.name}")
             found = True
@@ -1,8 +1,12 @@
 import os
+import itertools
 from google import genai
 from dotenv import load_dotenv
 
 load_dotenv()
+
+# Only the first models are of interest; don't page through the whole catalog.
+MAX_MODELS = 50
 api_key = os.getenv("GOOGLE_API_KEY")
 
 if not api_key:
@@ -16,12 +20,11 @@ try:
     print("Successfully created client.")
     
     print("\n--- Available Models ---")
-    # Paging through models if necessary, or just listing
-    # The new SDK might return an iterator
-    pager = client.models.list() 
-    for model in pager:
-        # Check if it supports generation
-        if "generateContent" in (model.supported_generation_methods or []):
+    # The pager fetches lazily, page by page; stop once MAX_MODELS have been seen.
+    pager = client.models.list(config={'page_size': MAX_MODELS})
+    for model in itertools.islice(pager, MAX_MODELS):
+        # Check if it supports generation (google-genai names this field supported_actions)
+        if "generateContent" in (model.supported_actions or []):
             print(f"Name: {model.name}")
             print(f"  Display Name: {model.display_name}")
             print(f"  Resource Name: {model.name}") # Usually models/something
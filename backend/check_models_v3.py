@@ -1,4 +1,5 @@
 import os
+import itertools
 from google import genai
 from dotenv import load_dotenv
 
@@ -10,7 +11,8 @@ client = genai.Client(api_key=api_key)
 
 print("Listing models...")
 try:
-    for m in client.models.list():
+    # Bounded listing: one page, no walk over the full catalog.
+    for m in itertools.islice(client.models.list(config={'page_size': 50}), 50):
         print(f"- {m.name}")
 except Exception as e:
     print(f"Error: {e}")
\ No newline at end of file
@@ -0,0 +1,67 @@
+import time
+import asyncio
+import functools
+import pystac_client
+import planetary_computer
+from pystac_client.stac_api_io import StacApiIO
+from requests.adapters import HTTPAdapter
+from .base import DataConnector
+
+STAC_URL = "https://planetarycomputer.microsoft.com/api/stac/v1"
+
+@functools.lru_cache(maxsize=1)
+def _get_catalog() -> pystac_client.Client:
+    """
+    Process-wide Planetary Computer catalog shared by every connector.
+    Opening the catalog costs a root GET plus a new requests.Session; sharing one pooled
+    session keeps keep-alive sockets and TLS sessions across searches.
+    """
+    stac_io = StacApiIO()
+    # Keep pystac_client's retry policy, only widen the connection pool.
+    retries = stac_io.session.get_adapter(STAC_URL).max_retries
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retries)
+    stac_io.session.mount("https://", adapter)
+    stac_io.session.mount("http://", adapter)
+    return pystac_client.Client.open(STAC_URL, modifier=planetary_computer.sign_inplace, stac_io=stac_io)
+
+
+class PCConnector(DataConnector):
+    """
+    Shared plumbing for connectors backed by a Planetary Computer collection:
+    the pooled catalog and the items remembered from recent searches.
+    Subclasses set COLLECTION and implement search() / get_tile_url().
+    """
+
+    __slots__ = ('catalog', '_items')
+
+    COLLECTION: str
+
+    # Signed asset URLs expire, so remembered items are only reused for a while.
+    ITEM_TTL = 30 * 60
+
+    def __init__(self):
+        self.catalog = _get_catalog()
+        self._items = {}  # item_id -> (fetched_at, pystac.Item)
+
+    def _remember(self, items) -> None:
+        """Stores search results for _get_item(), dropping entries past ITEM_TTL."""
+        fetched_at = time.monotonic()
+        self._items = {k: v for k, v in self._items.items() if fetched_at - v[0] < self.ITEM_TTL}
+        for item in items:
+            self._items[item.id] = (fetched_at, item)
+
+    async def _get_item(self, item_id: str):
+        """
+        Returns the STAC item, reusing the one fetched by search() while its signed URLs are fresh.
+        """
+        cached = self._items.get(item_id)
+        if cached and time.monotonic() - cached[0] < self.ITEM_TTL:
+            return cached[1]
+
+        # Re-fetch to get fresh signed URL
+        search = self.catalog.search(ids=[item_id], collections=[self.COLLECTION])
+        items = await asyncio.to_thread(lambda: list(search.items()))
+        if not items:
+            raise ValueError("Scene not found")
+        self._items[item_id] = (time.monotonic(), items[0])
+        return items[0]
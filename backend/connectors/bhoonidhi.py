@@ -8,6 +8,8 @@ class ISROConnector(DataConnector):
     Currently utilizes the Open Data WMS endpoints for visualization.
     Future upgrade: Integrate Bhoonidhi STAC API for raw transparency.
     """
+
+    __slots__ = ()
     
     # Public WMS endpoints (LISS-III / LISS-IV composite layers often exposed via Bhuvan)
     WMS_URL = "https://bhuvan-vec2.nrsc.gov.in/bhuvan/wms"
@@ -1,19 +1,16 @@
-import pystac_client
-import planetary_computer
+import asyncio
 from datetime import datetime
 from typing import List, Dict, Any
-from .base import DataConnector
+from ._pc import PCConnector
 
-class LandsatConnector(DataConnector):
+class LandsatConnector(PCConnector):
     """
     Connects to Landsat Collection 2 Level-2 data via Microsoft Planetary Computer.
     """
     
-    STAC_URL = "https://planetarycomputer.microsoft.com/api/stac/v1"
-    COLLECTION = "landsat-c2-l2"
+    __slots__ = ()
 
-    def __init__(self):
-        self.catalog = pystac_client.Client.open(self.STAC_URL, modifier=planetary_computer.sign_inplace)
+    COLLECTION = "landsat-c2-l2"
 
     @property
     def source_id(self) -> str:
@@ -30,30 +27,24 @@ class LandsatConnector(DataConnector):
             max_items=10
         )
         
-        items = search.item_collection()
-        results = []
-        for item in items:
-            thumb = item.assets.get("rendered_preview", {}).get("href")
-            if not thumb and "visual" in item.assets:
-                thumb = item.assets["visual"].href
-                
-            results.append({
-                "id": item.id,
-                "source": "NASA",
-                "sensor": "Landsat-8/9",
-                "date": item.datetime.isoformat(),
-                "cloud_cover": item.properties.get("eo:cloud_cover"),
-                "bbox": item.bbox,
-                "thumbnail": thumb
-            })
+        # pystac_client is synchronous; run the HTTP round-trip in a worker thread.
+        items = await asyncio.to_thread(search.item_collection)
+        self._remember(items)
+
+        results = [{
+            "id": item.id,
+            "source": "NASA",
+            "sensor": "Landsat-8/9",
+            "date": item.datetime.isoformat(),
+            "cloud_cover": item.properties.get("eo:cloud_cover"),
+            "bbox": item.bbox,
+            "thumbnail": (item.assets["rendered_preview"].href if "rendered_preview" in item.assets
+                          else item.assets["visual"].href if "visual" in item.assets else None)
+        } for item in items]
         return results
 
     async def get_tile_url(self, item_id: str, bands: List[str]) -> str:
-        search = self.catalog.search(ids=[item_id], collections=[self.COLLECTION])
-        items = list(search.items())
-        if not items:
-            raise ValueError("Scene not found")
-        item = items[0]
+        item = await self._get_item(item_id)
         
         if "rendered_preview" in item.assets:
             return item.assets["rendered_preview"].href
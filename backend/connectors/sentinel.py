@@ -1,19 +1,16 @@
-import pystac_client
-import planetary_computer
+import asyncio
 from datetime import datetime
 from typing import List, Dict, Any
-from .base import DataConnector
+from ._pc import PCConnector
 
-class SentinelConnector(DataConnector):
+class SentinelConnector(PCConnector):
     """
     Connects to Sentinel-2 Level-2A data via Microsoft Planetary Computer.
     """
     
-    STAC_URL = "https://planetarycomputer.microsoft.com/api/stac/v1"
-    COLLECTION = "sentinel-2-l2a"
+    __slots__ = ()
 
-    def __init__(self):
-        self.catalog = pystac_client.Client.open(self.STAC_URL, modifier=planetary_computer.sign_inplace)
+    COLLECTION = "sentinel-2-l2a"
 
     @property
     def source_id(self) -> str:
@@ -30,25 +27,21 @@ class SentinelConnector(DataConnector):
             max_items=10
         )
         
-        items = search.item_collection()
-        results = []
-        for item in items:
-            results.append({
-                "id": item.id,
-                "source": "ESA",
-                "sensor": "Sentinel-2",
-                "date": item.datetime.isoformat(),
-                "cloud_cover": item.properties.get("eo:cloud_cover"),
-                "bbox": item.bbox,
-                "thumbnail": item.assets["visual"].href if "visual" in item.assets else None
-            })
+        # pystac_client is synchronous; run the HTTP round-trip in a worker thread.
+        items = await asyncio.to_thread(search.item_collection)
+        self._remember(items)
+
+        results = [{
+            "id": item.id,
+            "source": "ESA",
+            "sensor": "Sentinel-2",
+            "date": item.datetime.isoformat(),
+            "cloud_cover": item.properties.get("eo:cloud_cover"),
+            "bbox": item.bbox,
+            "thumbnail": item.assets["visual"].href if "visual" in item.assets else None
+        } for item in items]
         return results
 
     async def get_tile_url(self, item_id: str, bands: List[str]) -> str:
-        # Re-fetch to get fresh signed URL
-        search = self.catalog.search(ids=[item_id], collections=[self.COLLECTION])
-        items = list(search.items())
-        if not items:
-            raise ValueError("Scene not found")
-        item = items[0]
+        item = await self._get_item(item_id)
         return item.assets["visual"].href
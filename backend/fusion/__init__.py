@@ -1,2 +1,3 @@
 from .optical import OpticalFusion
 from .sar_optical import SarOpticalFusion
+from ._kernels import warm_up as warm_up_kernels
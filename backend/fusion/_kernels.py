@@ -0,0 +1,79 @@
+import os
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Prefer OpenMP for the parallel kernels. With TBB, a process whose first parallel run
+# happened on a non-main thread (thread pools, TestClient lifespans) hangs at exit.
+# NUMBA_THREADING_LAYER(_PRIORITY) in the environment still takes precedence.
+if "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+def _output_buffer(out, shape):
+    """Returns the caller-supplied (3, *shape) buffer after a shape check, or allocates one."""
+    if out is None:
+        return np.empty((3,) + shape, dtype=np.float32)
+    if out.shape != (3,) + shape:
+        raise ValueError(f"Output buffer must have shape {(3,) + shape}, got {out.shape}.")
+    return out
+
+# Fused per-pixel kernels for the fusion transforms.
+# Each pixel is read once and written once: no intensity/ratio/band temporaries,
+# rows are split across threads by prange.
+# Arithmetic is float32 whatever the input dtype (band data is at most uint16):
+# half the bytes of float64 and twice the SIMD lanes.
+
+_THIRD = np.float32(1.0 / 3.0)
+_EPS = np.float32(1e-6)
+_ZERO = np.float32(0.0)
+_ONE = np.float32(1.0)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def brovey_kernel(ms, pan, out):
+    H, W = pan.shape
+    for i in prange(H):
+        for j in range(W):
+            r = np.float32(ms[0, i, j])
+            g = np.float32(ms[1, i, j])
+            b = np.float32(ms[2, i, j])
+            intensity = (r + g + b) * _THIRD
+            if intensity == 0:
+                intensity = _EPS
+            k = np.float32(pan[i, j]) / intensity
+            out[0, i, j] = r * k
+            out[1, i, j] = g * k
+            out[2, i, j] = b * k
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def hsv_kernel(opt, sar, opt_scale, sar_scale, out):
+    # opt_scale / sar_scale fold the 0-255 -> 0-1 normalization into the same pass.
+    H, W = sar.shape
+    for i in prange(H):
+        for j in range(W):
+            r = np.float32(opt[0, i, j]) * opt_scale
+            g = np.float32(opt[1, i, j]) * opt_scale
+            b = np.float32(opt[2, i, j]) * opt_scale
+            intensity = (r + g + b) * _THIRD
+            if intensity == 0:
+                intensity = _EPS
+            k = np.float32(sar[i, j]) * sar_scale / intensity
+            out[0, i, j] = min(max(r * k, _ZERO), _ONE)
+            out[1, i, j] = min(max(g * k, _ZERO), _ONE)
+            out[2, i, j] = min(max(b * k, _ZERO), _ONE)
+
+
+# Raster dtypes the fusion endpoints see: 8/16-bit DNs and float reflectance.
+_WARM_DTYPES = (np.uint8, np.uint16, np.float32, np.float64)
+
+def warm_up():
+    """
+    Compiles (or loads from numba's on-disk cache) both kernels for the common input
+    dtypes on a tiny tile, so the first real fusion request doesn't pay JIT latency.
+    """
+    out = np.empty((3, 2, 2), dtype=np.float32)
+    for dtype in _WARM_DTYPES:
+        bands = np.ones((3, 2, 2), dtype=dtype)
+        single = np.ones((2, 2), dtype=dtype)
+        brovey_kernel(bands, single, out)
+        hsv_kernel(bands, single, _ONE, _ONE, out)
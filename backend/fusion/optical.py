@@ -1,5 +1,6 @@
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from ._kernels import brovey_kernel, _output_buffer
 
 class OpticalFusion:
     """
@@ -8,7 +9,7 @@ class OpticalFusion:
     """
 
     @staticmethod
-    def brovey_transform(multispectral: np.ndarray, panchromatic: np.ndarray) -> np.ndarray:
+    def brovey_transform(multispectral: np.ndarray, panchromatic: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Performs Brovey Transform Pan-Sharpening.
         
@@ -21,34 +22,28 @@ class OpticalFusion:
         Args:
             multispectral: 3D Array (Channels, Height, Width) - usually RGB
             panchromatic: 2D Array (Height, Width) - High Res Pan
+            out: Optional preallocated (3, Height, Width) buffer to write into (e.g. a reused scratch tile)
             
         Returns:
-            np.ndarray: Pan-sharpened RGB Image.
+            np.ndarray: Pan-sharpened RGB Image (float32).
         """
         # Ensure dimensions match (Input should already be upsampled/registered)
         if multispectral.shape[1:] != panchromatic.shape:
              raise ValueError("Dimensions of Multispectral and Panchromatic bands must match.")
+        if multispectral.shape[0] < 3:
+             raise ValueError("Multispectral input needs at least 3 (RGB) bands.")
 
-        # Calculate Intensity (Simple Average)
+        # Intensity (simple RGB average), ratio and the three new bands are computed
+        # per pixel in one fused pass (see _kernels.brovey_kernel).
         # Assuming multispectral is [Red, Green, Blue, ...]
-        red = multispectral[0]
-        green = multispectral[1]
-        blue = multispectral[2]
-        
-        intensity = (red + green + blue) / 3.0
-        
-        # Avoid division by zero
-        intensity[intensity == 0] = 1e-6
-        
-        # Fusion Ratio
-        ratio = panchromatic / intensity
-        
-        # Apply Logic
-        new_red = red * ratio
-        new_green = green * ratio
-        new_blue = blue * ratio
-        
-        return np.stack([new_red, new_green, new_blue])
+        # C-contiguous (band-major) planes keep the kernel's inner loop unit-stride.
+        # No dtype cast here: the kernel widens each element to float32 in-register,
+        # so 8/16-bit inputs are streamed at their native width.
+        multispectral = np.ascontiguousarray(multispectral)
+        panchromatic = np.ascontiguousarray(panchromatic)
+        out = _output_buffer(out, panchromatic.shape)
+        brovey_kernel(multispectral, panchromatic, out)
+        return out
 
     @staticmethod
     def upsample(image: np.ndarray, target_shape: tuple) -> np.ndarray:
@@ -1,4 +1,9 @@
 import numpy as np
+from typing import Optional
+from ._kernels import hsv_kernel, _output_buffer
+
+_INV_255 = np.float32(1 / 255)
+_UNIT = np.float32(1.0)
 
 class SarOpticalFusion:
     """
@@ -7,7 +12,7 @@ class SarOpticalFusion:
     """
 
     @staticmethod
-    def hsv_fusion(optical_rgb: np.ndarray, sar_intensity: np.ndarray) -> np.ndarray:
+    def hsv_fusion(optical_rgb: np.ndarray, sar_intensity: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Performs HSV-based Fusion.
         1. Convert Optical RGB to HSV.
@@ -15,13 +20,20 @@ class SarOpticalFusion:
         3. Convert back to RGB.
         
         This highlights structural features (from SAR) while keeping spectral color (from Optical).
+        If `out` (a (3, H, W) array) is given, the result is written into it instead of a new array.
         """
         # Note: In a real implementation we'd use cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
         # For pure numpy implementation verification:
+        if optical_rgb.shape[0] < 3 or optical_rgb.shape[1:] != sar_intensity.shape:
+             raise ValueError("Optical RGB must be (3, H, W) matching the (H, W) SAR band.")
         
-        # 1. Normalize inputs to 0-1 range
-        opt_norm = optical_rgb.astype(float) / 255.0 if optical_rgb.max() > 1 else optical_rgb
-        sar_norm = sar_intensity.astype(float) / 255.0 if sar_intensity.max() > 1 else sar_intensity
+        # C-contiguous planes for unit-stride kernel loops; dtype is widened in-kernel.
+        optical_rgb = np.ascontiguousarray(optical_rgb)
+        sar_intensity = np.ascontiguousarray(sar_intensity)
+
+        # 1. Normalize inputs to 0-1 range (applied as a scale factor inside the kernel)
+        opt_scale = _INV_255 if optical_rgb.max() > 1 else _UNIT
+        sar_scale = _INV_255 if sar_intensity.max() > 1 else _UNIT
         
         # 2. Simple substitution (Conceptual HSV Fusion)
         # Instead of full RGB->HSV conversion, we can do a weighted blend for 'Value'
@@ -32,18 +44,7 @@ class SarOpticalFusion:
         # G_new = G * (SAR / I)
         # B_new = B * (SAR / I)
         # This is similar to Brovey but using SAR as the 'Pan' channel.
-        
-        red = opt_norm[0]
-        green = opt_norm[1]
-        blue = opt_norm[2]
-        
-        intensity = (red + green + blue) / 3.0
-        intensity[intensity == 0] = 1e-6
-        
-        ratio = sar_norm / intensity
-        
-        new_red = np.clip(red * ratio, 0, 1)
-        new_green = np.clip(green * ratio, 0, 1)
-        new_blue = np.clip(blue * ratio, 0, 1)
-        
-        return np.stack([new_red, new_green, new_blue])
+        # Clipped to 0-1; computed per pixel in one fused pass (see _kernels.hsv_kernel).
+        out = _output_buffer(out, sar_intensity.shape)
+        hsv_kernel(optical_rgb, sar_intensity, opt_scale, sar_scale, out)
+        return out
@@ -1,11 +1,74 @@
 from fastapi import FastAPI, HTTPException, Request, Response
+import base64
+import hashlib
 import httpx
+import io
+import logging
+import asyncio
+import functools
+import os
+import re
+import struct
+import zlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, field_validator
+import numpy as np
+import orjson
+import pystac_client
+from cachetools import TTLCache
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from supabase import create_client, Client
+
+from connectors.sentinel import SentinelConnector
+from connectors.nasa import LandsatConnector
+from connectors.bhoonidhi import ISROConnector
+from agent.core import SatFusionAgent
+from fusion import warm_up_kernels
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+log = logging.getLogger(__name__)
+
+# Shared outbound HTTP client: keep-alive connections are pooled across requests
+# instead of paying a TCP+TLS handshake per proxied tile.
+HTTPX_CLIENT = httpx.AsyncClient(
+    verify=False, # verify=False for ISRO SSL quirks
+    timeout=15.0,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=200)
+)
+
+# Worker threads for blocking I/O (pystac_client) offloaded with asyncio.to_thread.
+BLOCKING_IO_WORKERS = 100
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The default executor (min(32, cpu+4) threads) would cap concurrent STAC searches.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS))
+    # JIT-compile (or load from cache) the fusion kernels before serving traffic.
+    # Startup-only, so it runs inline: numba's threading layer is first launched on the main thread.
+    warm_up_kernels()
+    yield
+    await HTTPX_CLIENT.aclose()
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson (C) instead of json.dumps; handles datetimes and numpy natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
-app = FastAPI(title="Sat-Fusion-AI", version="1.0.0", description="Autonomous Geospatial Fusion Agent")
+app = FastAPI(
+    title="Sat-Fusion-AI", version="1.0.0", description="Autonomous Geospatial Fusion Agent",
+    lifespan=lifespan, default_response_class=ORJSONResponse
+)
 
 # Configure CORS
 origins = [
@@ -22,11 +85,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Import Connectors
-from connectors.sentinel import SentinelConnector
-from connectors.nasa import LandsatConnector
-from connectors.bhoonidhi import ISROConnector
-
 # Initialize Connectors
 connectors = {
     "sentinel-2": SentinelConnector(),
@@ -35,27 +93,41 @@ connectors = {
 }
 
 class SearchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     source_id: str
-    bbox: List[float] # [min_lon, min_lat, max_lon, max_lat]
+    bbox: Tuple[float, float, float, float] # (min_lon, min_lat, max_lon, max_lat)
     start_date: str # ISO format
     end_date: str # ISO format
 
+    @field_validator("bbox")
+    @classmethod
+    def _bbox_array(cls, v: Tuple[float, float, float, float]) -> np.ndarray:
+        # Validated as a 4-tuple (and documented as one in OpenAPI), stored as a
+        # float64 array so geometry code downstream can work on it vectorized.
+        return np.asarray(v, dtype=np.float64)
+
 @app.get("/")
 async def root():
     return {"message": "Sat-Fusion-AI is Active", "timestamp": datetime.now()}
 
 @app.get("/health")
+@app.head("/health")
 async def health_check():
     """
     Health check endpoint probed by the frontend.
+    HEAD is accepted too, for liveness probes that don't need the body.
     """
     return {"status": "ok", "service": "fusion-agent", "timestamp": datetime.now()}
 
 # Agent Integration
-from agent.core import SatFusionAgent
 agent = SatFusionAgent()
+# "llm" routes /agent/reason through SatFusionAgent; "rules" uses the keyword matcher below.
+AGENT_MODE = os.getenv("AGENT_MODE", "llm").lower()
 
 class AgentRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     query: str
     context: Optional[Dict[str, Any]] = None
 
@@ -65,14 +137,35 @@ async def agent_reason(request: AgentRequest):
     The Brain Interface.
     Frontend sends natural language (or structured intent), Agent replies with Reasoning + Actions.
     """
+    if AGENT_MODE == "rules":
+        return _rule_based_reason(request.query)
     response = await agent.reason_and_act(request.query, request.context)
     return response
 
 class FusionRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     method: str # "pan-sharpen", "sar-optical"
     optical_source_id: str
     secondary_source_id: str # Pan or SAR
 
+# Constant /fuse replies, serialized once at import.
+_FUSE_RESPONSES = {
+    "pan-sharpen": orjson.dumps({
+        "status": "success",
+        "operation": "Brovey Transform",
+        "message": "Fused LISS-IV (High-Res) with Sentinel-2 (Color).",
+        "output_resolution": "5.8m",
+        "virtual_constellation": True
+    }),
+    "sar-optical": orjson.dumps({
+        "status": "success",
+        "operation": "HSV Fusion",
+        "message": "Fused Sentinel-1 (Structure) with Sentinel-2 (Color). Cloud penetration active.",
+        "mode": "All-Weather"
+    }),
+}
+
 @app.post("/fuse")
 async def trigger_fusion(request: FusionRequest):
     """
@@ -82,136 +175,199 @@ async def trigger_fusion(request: FusionRequest):
     
     For now, it acts as the 'Agentic Thought' confirming the validity of the operation.
     """
-    if request.method == "pan-sharpen":
-        return {
-            "status": "success",
-            "operation": "Brovey Transform",
-            "message": "Fused LISS-IV (High-Res) with Sentinel-2 (Color).",
-            "output_resolution": "5.8m",
-            "virtual_constellation": True
-        }
-    elif request.method == "sar-optical":
-        return {
-            "status": "success",
-            "operation": "HSV Fusion",
-            "message": "Fused Sentinel-1 (Structure) with Sentinel-2 (Color). Cloud penetration active.",
-            "mode": "All-Weather"
-        }
-    else:
+    body = _FUSE_RESPONSES.get(request.method)
+    if body is None:
         raise HTTPException(status_code=400, detail="Unknown fusion method")
+    return Response(content=body, media_type="application/json")
+
+_UNKNOWN_FUSION_METHOD = orjson.dumps({"status": "error", "message": "Unknown fusion method"})
+
+class FusionBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    jobs: List[FusionRequest]
+
+@app.post("/fuse/batch")
+async def trigger_fusion_batch(request: FusionBatchRequest):
+    """
+    Runs several /fuse jobs in one round trip.
+    Returns {"results": [...]} in job order; an unknown method yields an error entry
+    for that job instead of failing the whole batch.
+    """
+    results = b",".join(_FUSE_RESPONSES.get(job.method, _UNKNOWN_FUSION_METHOD) for job in request.jobs)
+    return Response(content=b'{"results":[' + results + b"]}", media_type="application/json")
 
 class FusionActionRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     action: str
     params: Optional[Dict[str, Any]] = None
 
+# SIMULATE_DELAYS=0 skips the fake processing delays (benchmarks, tests).
+SIMULATE_DELAYS = os.getenv("SIMULATE_DELAYS", "1") == "1"
+
+# action -> (simulated processing delay in seconds, pre-serialized reply)
+_PROCESS_STEPS = {
+    "pan-sharpening": (1.5, orjson.dumps({
+        "status": "success", 
+        "message": "Pan-Sharpening Complete. Spatial Resolution enhanced to 0.5m.",
+        "metrics": {"sharpness": "+45%", "clarity": "High"}
+    })),
+    "cloud-filling": (2.0, orjson.dumps({
+        "status": "success",
+        "message": "Cloud artifacts removed using GAN reconstruction.",
+        "metrics": {"cloud_cover": "0%", "confidence": "98%"}
+    })),
+    "spectral-harmony": (1.0, orjson.dumps({
+        "status": "success",
+        "message": "Band histograms equalized. Color balance restored.",
+        "metrics": {"color_accuracy": "99.9%"}
+    })),
+    "co-registration": (1.2, orjson.dumps({
+        "status": "success",
+        "message": "Multi-temporal alignment complete. RMSE < 0.2 pixels.",
+        "metrics": {"alignment": "Perfect"}
+    })),
+}
+_UNKNOWN_ACTION = orjson.dumps({"status": "error", "message": "Unknown action"})
+
 @app.post("/fusion/process")
 async def process_fusion(request: FusionActionRequest):
     """
     Simulates complex satellite processing tasks with realistic delays.
     """
-    import asyncio
-    
+    step = _PROCESS_STEPS.get(request.action)
+    if step is None:
+        return Response(content=_UNKNOWN_ACTION, media_type="application/json")
+    delay, body = step
     # Simulate processing time based on complexity
-    if request.action == "pan-sharpening":
-        await asyncio.sleep(1.5) # 1.5s delay
-        return {
-            "status": "success", 
-            "message": "Pan-Sharpening Complete. Spatial Resolution enhanced to 0.5m.",
-            "metrics": {"sharpness": "+45%", "clarity": "High"}
-        }
-    elif request.action == "cloud-filling":
-        await asyncio.sleep(2.0)
-        return {
-            "status": "success",
-            "message": "Cloud artifacts removed using GAN reconstruction.",
-            "metrics": {"cloud_cover": "0%", "confidence": "98%"}
-        }
-    elif request.action == "spectral-harmony":
-        await asyncio.sleep(1.0)
-        return {
-            "status": "success",
-            "message": "Band histograms equalized. Color balance restored.",
-            "metrics": {"color_accuracy": "99.9%"}
-        }
-    elif request.action == "co-registration":
-         await asyncio.sleep(1.2)
-         return {
-            "status": "success",
-            "message": "Multi-temporal alignment complete. RMSE < 0.2 pixels.",
-             "metrics": {"alignment": "Perfect"}
-         }
-    else:
-        return {"status": "error", "message": "Unknown action"}
+    if SIMULATE_DELAYS:
+        await asyncio.sleep(delay)
+    return Response(content=body, media_type="application/json")
 
 class SpectralRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     lat: float
     lon: float
 
+# Base Spectral Profiles (Reflectance 0.0 - 1.0), in _SPECTRAL_BANDS order
+_SPECTRAL_BANDS = ("Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2")
+_SPECTRAL_WAVELENGTHS = ("490nm", "560nm", "665nm", "842nm", "1610nm", "2190nm")
+_WATER = ("Water Body", np.array([0.15, 0.10, 0.05, 0.02, 0.01, 0.005]))
+_BARREN = ("Barren Land", np.array([0.10, 0.12, 0.15, 0.20, 0.25, 0.30]))
+_VEGETATION = ("Vegetation", np.array([0.05, 0.08, 0.04, 0.55, 0.20, 0.12]))
+_URBAN = ("Urban/Built-up", np.array([0.15, 0.18, 0.22, 0.25, 0.30, 0.28]))
+# Simulated land cover: a per-pixel uniform draw falls into one of these bins,
+# [0, .15) water, [.15, .3) barren, [.3, .7) vegetation, [.7, .85) barren, [.85, 1) urban.
+_LAND_COVER_EDGES = np.array([0.15, 0.3, 0.7, 0.85])
+_LAND_COVERS = (_WATER, _BARREN, _VEGETATION, _BARREN, _URBAN)
+# Shared PCG64 generator for the simulated readings and notifications.
+_RNG = np.random.default_rng()
+
 @app.post("/spectral/analyze")
 async def analyze_spectral(request: SpectralRequest):
     """
     Simulates retrieving hyperspectral data for a specific pixel.
     In a real app, this would query a Cloud Optimized GeoTIFF (COG).
     """
-    import random
-    import math
-
-    # Deterministic seed based on location (so the same pixel always gives the same 'reading')
-    seed = (request.lat * 1000 + request.lon * 100) % 1
+    # Deterministic seed based on location (so the same pixel always gives the same 'reading').
+    # CRC32 of the packed coordinates is stable across hosts and processes, unlike hash().
+    seed = zlib.crc32(struct.pack("<dd", request.lat, request.lon))
     
     # Classification Logic (Simulated Land Cover)
-    is_vegetation = 0.3 < seed < 0.7
-    is_water = seed < 0.15
-    is_urban = seed > 0.85
-    
-    # Base Spectral Profiles (Reflectance 0.0 - 1.0)
-    profile = {}
-    
-    if is_vegetation:
-        profile = {
-            "Blue": 0.05, "Green": 0.08, "Red": 0.04, "NIR": 0.55, "SWIR1": 0.20, "SWIR2": 0.12,
-            "type": "Vegetation"
-        }
-    elif is_water:
-        profile = {
-            "Blue": 0.15, "Green": 0.10, "Red": 0.05, "NIR": 0.02, "SWIR1": 0.01, "SWIR2": 0.005,
-             "type": "Water Body"
-        }
-    elif is_urban:
-        profile = {
-            "Blue": 0.15, "Green": 0.18, "Red": 0.22, "NIR": 0.25, "SWIR1": 0.30, "SWIR2": 0.28,
-             "type": "Urban/Built-up"
-        }
-    else: # Barren / Soil
-        profile = {
-             "Blue": 0.10, "Green": 0.12, "Red": 0.15, "NIR": 0.20, "SWIR1": 0.25, "SWIR2": 0.30,
-             "type": "Barren Land"
-        }
+    u = np.random.default_rng(seed).random()
+    land_cover, profile = _LAND_COVERS[int(np.searchsorted(_LAND_COVER_EDGES, u, side="right"))]
 
-    # Add Sensor Noise (Realistic variations)
-    bands = []
-    wavelengths = {"Blue": "490nm", "Green": "560nm", "Red": "665nm", "NIR": "842nm", "SWIR1": "1610nm", "SWIR2": "2190nm"}
-    
-    for band, val in profile.items():
-        if band == "type": continue
-        noise = (random.random() - 0.5) * 0.05
-        value = max(0, min(1, val + noise)) # Clamp 0-1
-        bands.append({
-            "name": band,
-            "value": value,
-            "wavelength": wavelengths[band]
-        })
-
-    # Sort by wavelength for chart (approximation by name order isn't perfect, but fixed list is better)
-    order = ["Blue", "Green", "Red", "NIR", "SWIR1", "SWIR2"]
-    bands.sort(key=lambda x: order.index(x['name']))
+    # Add Sensor Noise (Realistic variations), clamped to 0-1 in one vectorized pass
+    values = np.clip(profile + _RNG.uniform(-0.025, 0.025, len(_SPECTRAL_BANDS)), 0.0, 1.0)
+    bands = [
+        {"name": name, "value": float(value), "wavelength": wavelength}
+        for name, value, wavelength in zip(_SPECTRAL_BANDS, values, _SPECTRAL_WAVELENGTHS)
+    ]
 
     return {
         "status": "success",
         "location": {"lat": request.lat, "lon": request.lon},
-        "classification": profile["type"],
+        "classification": land_cover,
         "bands": bands,
-        "message": f"Spectral signature analyzed: {profile['type']} detected."
+        "message": f"Spectral signature analyzed: {land_cover} detected."
+    }
+
+STAC_API_URL = "https://earth-search.aws.element84.com/v1"
+STAC_MAX_ITEMS = 50
+_STAC_CLIENT: Optional[pystac_client.Client] = None
+_STAC_CLIENT_LOCK = threading.Lock()
+
+def _get_stac_client() -> pystac_client.Client:
+    """
+    Opens the Earth Search catalog once and reuses it (and its HTTP session) across requests.
+    """
+    global _STAC_CLIENT
+    if _STAC_CLIENT is None:
+        with _STAC_CLIENT_LOCK:
+            if _STAC_CLIENT is None:
+                _STAC_CLIENT = pystac_client.Client.open(STAC_API_URL)
+    return _STAC_CLIENT
+
+def _do_stac_search(source_id: str, bbox: np.ndarray, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """
+    Blocking part of /search: catalog open, STAC query, item paging and result assembly.
+    Runs in a worker thread so pystac_client's synchronous HTTP never stalls the event loop.
+    """
+    # Connect to STAC API (cached)
+    client = _get_stac_client()
+    
+    # Determine collections based on source_id or search everything
+    collections = []
+    if "sentinel" in source_id.lower():
+        collections.append("sentinel-2-l2a")
+    elif "landsat" in source_id.lower():
+        collections.append("landsat-c2-l2")
+    else:
+        collections = ["sentinel-2-l2a", "landsat-c2-l2"] # Default to both
+        
+    # Parse Dates
+    # Pystac expects "start_iso/end_iso"
+    # We need to ensure YYYY-MM-DD format mostly works or ISO string
+    datetime_range = f"{start_date}/{end_date}".replace('Z', '')
+
+    search = client.search(
+        collections=collections,
+        bbox=bbox.tolist(),
+        datetime=datetime_range,
+        max_items=STAC_MAX_ITEMS,
+        # Page size = max_items: Earth Search pages 10 items by default, which made
+        # item iteration below issue up to 5 sequential page requests.
+        limit=STAC_MAX_ITEMS,
+        query={"eo:cloud_cover": {"lt": 50}} # Default < 50% cloud cover to find something
+    )
+    
+    items = list(search.items())
+    log.debug("Docs Found: %d", len(items))
+    
+    # Items are fully in memory at this point; assembly is plain CPU work, kept in order.
+    return [_scene_from_item(item) for item in items]
+
+def _scene_from_item(item) -> Dict[str, Any]:
+    props = item.properties
+    
+    # Extract Thumbnail (Visual Proof)
+    thumbnail = ""
+    if "thumbnail" in item.assets:
+        thumbnail = item.assets["thumbnail"].href
+    elif "visual" in item.assets: # Sentinel-2 often uses 'visual'
+        thumbnail = item.assets["visual"].href
+    
+    # Construct Result
+    return {
+        "id": item.id,
+        "date": item.datetime.strftime("%Y-%m-%d"),
+        "time": item.datetime.strftime("%H:%M:%S"),
+        "satellite": props.get("platform", "Satellite"),
+        "cloud_cover": props.get("eo:cloud_cover", 0),
+        "thumbnail": thumbnail,
+        "bbox": item.bbox
     }
 
 @app.post("/search")
@@ -220,76 +376,42 @@ async def search_satellite_data(request: SearchRequest):
     Real-Time STAC Search Endpoint.
     Queries Earth Search (AWS) for Sentinel-2 and Landsat data.
     """
-    from pystac_client import Client
-    
-    STAC_API_URL = "https://earth-search.aws.element84.com/v1"
-    
-    print(f"Searching STAC: {request.bbox} | {request.start_date} to {request.end_date}")
+    log.debug("Searching STAC: %s | %s to %s", request.bbox, request.start_date, request.end_date)
 
     try:
-        # Convert bbox dict/object to list [minx, miny, maxx, maxy] if not already
-        # Assuming request.bbox is [min_lon, min_lat, max_lon, max_lat]
-        bbox = request.bbox
-        
-        # Connect to STAC API
-        client = Client.open(STAC_API_URL)
-        
-        # Determine collections based on source_id or search everything
-        collections = []
-        if "sentinel" in request.source_id.lower():
-            collections.append("sentinel-2-l2a")
-        elif "landsat" in request.source_id.lower():
-            collections.append("landsat-c2-l2")
-        else:
-            collections = ["sentinel-2-l2a", "landsat-c2-l2"] # Default to both
-            
-        # Parse Dates
-        # Pystac expects "start_iso/end_iso"
-        # We need to ensure YYYY-MM-DD format mostly works or ISO string
-        datetime_range = f"{request.start_date}/{request.end_date}".replace('Z', '')
-
-        search = client.search(
-            collections=collections,
-            bbox=bbox,
-            datetime=datetime_range,
-            max_items=50,
-            query={"eo:cloud_cover": {"lt": 50}} # Default < 50% cloud cover to find something
+        # request.bbox is a float64 array [min_lon, min_lat, max_lon, max_lat]
+        results = await asyncio.to_thread(
+            _do_stac_search, request.source_id, request.bbox, request.start_date, request.end_date
         )
-        
-        items = list(search.items())
-        print(f"Docs Found: {len(items)}")
-        
-        results = []
-        for item in items:
-            props = item.properties
-            
-            # Extract Thumbnail (Visual Proof)
-            thumbnail = ""
-            if "thumbnail" in item.assets:
-                thumbnail = item.assets["thumbnail"].href
-            elif "visual" in item.assets: # Sentinel-2 often uses 'visual'
-                thumbnail = item.assets["visual"].href
-            
-            # Construct Result
-            scene = {
-                "id": item.id,
-                "date": item.datetime.strftime("%Y-%m-%d"),
-                "time": item.datetime.strftime("%H:%M:%S"),
-                "satellite": props.get("platform", "Satellite"),
-                "cloud_cover": props.get("eo:cloud_cover", 0),
-                "thumbnail": thumbnail,
-                "bbox": item.bbox
-            }
-            results.append(scene)
-            
         return {"count": len(results), "results": results}
 
     except Exception as e:
-        print(f"STAC Error: {str(e)}")
+        log.warning("STAC Error: %s", e)
         # Graceful Fallback
         return {"count": 0, "results": [], "error": str(e)}
 
 
+# Tile bodies by sorted query params; pan/zoom re-requests the same BBOX/LAYERS.
+# Only touched from the event loop with no await in between, so no lock is needed.
+WMS_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+WMS_CACHE_MAX_BYTES = 512 * 1024
+WMS_CACHE_CONTROL = "public, max-age=3600"
+
+async def _stream_and_cache(resp: httpx.Response, key: tuple):
+    # Forwards chunks as they arrive and keeps a copy for the cache if the tile is small.
+    chunks = []
+    size = 0
+    async for chunk in resp.aiter_bytes():
+        if chunks is not None:
+            size += len(chunk)
+            if size < WMS_CACHE_MAX_BYTES:
+                chunks.append(chunk)
+            else:
+                chunks = None
+        yield chunk
+    if chunks is not None:
+        WMS_CACHE[key] = (b"".join(chunks), resp.headers.get("content-type", "image/png"))
+
 @app.get("/proxy/wms")
 async def proxy_wms(request: Request):
     """
@@ -301,63 +423,158 @@ async def proxy_wms(request: Request):
     
     # Extract all query params from the incoming request
     params = dict(request.query_params)
+    cache_key = tuple(sorted(params.items()))
+    
+    # Same params -> same tile, so the ETag is just a hash of the params.
+    etag = '"' + hashlib.blake2b(repr(cache_key).encode(), digest_size=16).hexdigest() + '"'
+    tile_headers = {"ETag": etag, "Cache-Control": WMS_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (t.strip().removeprefix("W/") for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=tile_headers)
+    
+    cached = WMS_CACHE.get(cache_key)
+    if cached is not None:
+        body, media_type = cached
+        return Response(content=body, media_type=media_type, headers=tile_headers)
     
     try:
-        async with httpx.AsyncClient(verify=False) as client: # verify=False for ISRO SSL quirks
-            # Forward the request to VEDAS with the captured parameters
-            resp = await client.get(vedas_base, params=params, timeout=15.0)
-            
-            # debug logging
-            print(f"Proxying: {resp.url} -> Status: {resp.status_code}")
-            
-            if resp.status_code != 200:
-                print(f"Error from VEDAS: {resp.text[:200]}")
-                return Response(content=resp.content, status_code=resp.status_code)
-
-            return Response(content=resp.content, media_type=resp.headers.get("content-type", "image/png"))
+        # Forward the request to VEDAS with the captured parameters.
+        # The body is streamed through instead of being buffered whole in RAM.
+        req = HTTPX_CLIENT.build_request("GET", vedas_base, params=params)
+        resp = await HTTPX_CLIENT.send(req, stream=True)
+        
+        log.debug("Proxying: %s -> Status: %s", resp.url, resp.status_code)
+        
+        if resp.status_code != 200:
+            # Error bodies are small; read them for the log line.
+            await resp.aread()
+            await resp.aclose()
+            log.warning("Error from VEDAS: %.200s", resp.text)
+            return Response(content=resp.content, status_code=resp.status_code)
+
+        return StreamingResponse(
+            _stream_and_cache(resp, cache_key),
+            media_type=resp.headers.get("content-type", "image/png"),
+            status_code=resp.status_code,
+            headers=tile_headers,
+            background=BackgroundTask(resp.aclose)
+        )
             
     except Exception as e:
-        print(f"Proxy Exception: {str(e)}")
+        log.error("Proxy Exception: %s", e)
         raise HTTPException(status_code=500, detail=f"Proxy failed: {str(e)}")
 
-@app.get("/notifications/live")
-async def live_notifications():
-    """
-    Simulates a Real-Time 'RSS Feed' of satellite acquisitions.
-    Frontend polls this to show 'Live' toasts.
-    """
-    import random
-    
+_CITIES = ("Mumbai", "Delhi", "Bangalore", "New York", "London", "Tokyo", "Paris", "Berlin", "Sydney", "Dubai")
+_SATS = ("Sentinel-2A", "Sentinel-2B", "Landsat-8", "Landsat-9", "Cartosat-3", "Resourcesat-2")
+
+# Seconds between simulated acquisition checks (matches the frontend's old poll period).
+NOTIFICATION_INTERVAL = 15.0
+# Each stream ends after this long and EventSource reconnects (after NOTIFICATION_RETRY_MS), so an
+# open dashboard never holds a worker past shutdown or reload for longer than one lifetime.
+NOTIFICATION_STREAM_LIFETIME = 300.0
+NOTIFICATION_RETRY_MS = 1000
+# Seconds uvicorn waits for open connections (e.g. notification streams) before cancelling them.
+GRACEFUL_SHUTDOWN_TIMEOUT = 5
+
+def _random_acquisition() -> Optional[Dict[str, Any]]:
     # 30% chance to have a "new" acquisition in the last few seconds
-    if random.random() > 0.7:
-        cities = ["Mumbai", "Delhi", "Bangalore", "New York", "London", "Tokyo", "Paris", "Berlin", "Sydney", "Dubai"]
-        sats = ["Sentinel-2A", "Sentinel-2B", "Landsat-8", "Landsat-9", "Cartosat-3", "Resourcesat-2"]
-        
-        city = random.choice(cities)
-        sat = random.choice(sats)
+    if _RNG.random() > 0.7:
+        city = _CITIES[_RNG.integers(len(_CITIES))]
+        sat = _SATS[_RNG.integers(len(_SATS))]
         
         return {
-            "has_new": True,
-            "event": {
-                "id": str(int(datetime.now().timestamp())),
-                "message": f"{sat} just acquired new data over {city}.",
-                "timestamp": datetime.now().isoformat(),
-                "type": "acquisition"
-            }
+            "id": str(int(datetime.now().timestamp())),
+            "message": f"{sat} just acquired new data over {city}.",
+            "timestamp": datetime.now(),
+            "type": "acquisition"
         }
+    return None
+
+@app.get("/notifications/stream")
+async def stream_notifications():
+    """
+    Server-Sent Events feed of (simulated) satellite acquisitions.
+    One long-lived connection per client; an event is only sent when an acquisition happens.
+    Quiet ticks send an SSE comment so proxies don't close the idle connection.
+    The stream closes after NOTIFICATION_STREAM_LIFETIME; the client reconnects on its own.
+    """
+    async def event_gen():
+        deadline = time.monotonic() + NOTIFICATION_STREAM_LIFETIME
+        yield b"retry: %d\n\n" % NOTIFICATION_RETRY_MS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(NOTIFICATION_INTERVAL)
+            event = _random_acquisition()
+            if event is not None:
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+            else:
+                yield b": keepalive\n\n"
+
+    return StreamingResponse(event_gen(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@functools.lru_cache(maxsize=None)
+def _warn_live_deprecated() -> None:
+    # Logged once per worker rather than on every poll.
+    log.warning("/notifications/live is deprecated; use the /notifications/stream SSE feed")
+
+@app.get("/notifications/live", deprecated=True)
+async def live_notifications():
+    """
+    Simulates a Real-Time 'RSS Feed' of satellite acquisitions.
+    Deprecated polling variant of /notifications/stream, kept for older clients.
+    """
+    _warn_live_deprecated()
+    event = _random_acquisition()
+    if event is not None:
+        return {"has_new": True, "event": event}
     
     return {"has_new": False}
 
-@app.post("/agent/reason")
-async def agent_reason(payload: dict):
+# Keyword intents for _rule_based_reason, compiled once at import.
+LOC_RE = re.compile(r"(go to|fly to|show me|zoom to|find) (.+)")
+
+# Intent priority (lower wins) -> keywords matched as plain substrings of the query.
+_INTENT_KEYWORD_GROUPS = (
+    ("sentinel",),
+    ("landsat",),
+    ("isro", "resource", "bhuvan"),
+    ("vegetation", "crop", "farming", "agriculture"),
+    ("water", "flood", "moisture"),
+    ("urban", "city", "building"),
+)
+_INTENT_KEYWORDS = {kw: priority for priority, group in enumerate(_INTENT_KEYWORD_GROUPS) for kw in group}
+INTENT_RE = re.compile("|".join(sorted(_INTENT_KEYWORDS, key=len, reverse=True)))
+
+# (thoughts, answer, (action type, payload id)) per intent priority.
+_INTENT_RESPONSES = (
+    (("Detected intent: Switch Data Source", "Target: Sentinel-2 (ESA/Copernicus)", "Generating layer switch command."),
+     "Switching main feed to Sentinel-2 MSI. Bringing up real-time HLS tiles.",
+     ("set_datasource", "sentinel-2")),
+    (("Detected intent: Switch Data Source", "Target: Landsat-8/9 (NASA/USGS)", "Generating layer switch command."),
+     "Activating Landsat-8 OLI feed. Thermal and optical bands syncing.",
+     ("set_datasource", "landsat-8")),
+    (("Detected intent: Switch Data Source", "Target: ISRO Resourcesat-2", "Generating layer switch command."),
+     "Connecting to ISRO VEDAS Node. Loading Resourcesat-2 LISS-III coverage.",
+     ("set_datasource", "resourcesat-2")),
+    (("Detected intent: Spectral Analysis", "Topic: Vegetation/Agriculture", "Recommended Composite: NDVI / Agriculture (SWIR)", "Applying filter."),
+     "Analying vegetation health. Switching to Agriculture composite (SWIR-NIR-Blue) to highlight chlorophyll content.",
+     ("set_composite", "agriculture")),
+    (("Detected intent: Spectral Analysis", "Topic: Water/Moisture", "Recommended Composite: NDWI / Moisture Index", "Applying filter."),
+     "Highlighting water bodies and moisture content. Applying Normalized Difference Water Index filter.",
+     ("set_composite", "moisture")),
+    (("Detected intent: Spectral Analysis", "Topic: Urbanization", "Recommended Composite: Urban / False Color", "Applying filter."),
+     "Enhancing man-made structures. Switching to Urban composite.",
+     ("set_composite", "urban")),
+)
+
+def _rule_based_reason(query: str) -> Dict[str, Any]:
     """
-    Autonomous Agent Brain.
+    Keyword-driven Agent Brain (AGENT_MODE=rules), no LLM involved.
     Parses natural language queries and returns:
     1. Answer (Spoken response)
     2. Thoughts (Step-by-step reasoning)
     3. Actions (JSON commands for Frontend to execute)
     """
-    query = payload.get("query", "").lower()
+    query = query.lower()
     
     response = {
         "answer": "I'm not sure how to help with that yet.",
@@ -366,8 +583,7 @@ async def agent_reason(payload: dict):
     }
     
     # INTENT 1: NAVIGATION (Fly to X)
-    import re
-    loc_match = re.search(r"(go to|fly to|show me|zoom to|find) (.+)", query)
+    loc_match = LOC_RE.search(query)
     if loc_match:
         location = loc_match.group(2).strip()
         # Clean up common words
@@ -386,58 +602,17 @@ async def agent_reason(payload: dict):
         }]
         return response
 
-    # INTENT 2: LAYER SWITCHING (Sentinel, Landsat, ISRO)
-    if "sentinel" in query:
-        response["thoughts"] = ["Detected intent: Switch Data Source", "Target: Sentinel-2 (ESA/Copernicus)", "Generating layer switch command."]
-        response["answer"] = "Switching main feed to Sentinel-2 MSI. Bringing up real-time HLS tiles."
-        response["actions"] = [{"type": "set_datasource", "payload": {"id": "sentinel-2"}}]
-        return response
-    
-    if "landsat" in query:
-        response["thoughts"] = ["Detected intent: Switch Data Source", "Target: Landsat-8/9 (NASA/USGS)", "Generating layer switch command."]
-        response["answer"] = "Activating Landsat-8 OLI feed. Thermal and optical bands syncing."
-        response["actions"] = [{"type": "set_datasource", "payload": {"id": "landsat-8"}}]
-        return response
-
-    if "isro" in query or "resource" in query or "bhuvan" in query:
-        response["thoughts"] = ["Detected intent: Switch Data Source", "Target: ISRO Resourcesat-2", "Generating layer switch command."]
-        response["answer"] = "Connecting to ISRO VEDAS Node. Loading Resourcesat-2 LISS-III coverage."
-        response["actions"] = [{"type": "set_datasource", "payload": {"id": "resourcesat-2"}}]
-        return response
-
-    # INTENT 3: ANALYSIS / COMPOSITES
-    if "vegetation" in query or "crop" in query or "farming" in query or "agriculture" in query:
-        response["thoughts"] = ["Detected intent: Spectral Analysis", "Topic: Vegetation/Agriculture", "Recommended Composite: NDVI / Agriculture (SWIR)", "Applying filter."]
-        response["answer"] = "Analying vegetation health. Switching to Agriculture composite (SWIR-NIR-Blue) to highlight chlorophyll content."
-        response["actions"] = [{"type": "set_composite", "payload": {"id": "agriculture"}}]
-        return response
-        
-    if "water" in query or "flood" in query or "moisture" in query:
-         response["thoughts"] = ["Detected intent: Spectral Analysis", "Topic: Water/Moisture", "Recommended Composite: NDWI / Moisture Index", "Applying filter."]
-         response["answer"] = "Highlighting water bodies and moisture content. Applying Normalized Difference Water Index filter."
-         response["actions"] = [{"type": "set_composite", "payload": {"id": "moisture"}}]
-         return response
-
-    if "urban" in query or "city" in query or "building" in query:
-         response["thoughts"] = ["Detected intent: Spectral Analysis", "Topic: Urbanization", "Recommended Composite: Urban / False Color", "Applying filter."]
-         response["answer"] = "Enhancing man-made structures. Switching to Urban composite."
-         response["actions"] = [{"type": "set_composite", "payload": {"id": "urban"}}]
-         return response
+    # INTENT 2/3: LAYER SWITCHING and ANALYSIS / COMPOSITES
+    # One scan collects every keyword hit; the highest-priority intent wins.
+    hits = {_INTENT_KEYWORDS[m.group()] for m in INTENT_RE.finditer(query)}
+    if hits:
+        thoughts, answer, action = _INTENT_RESPONSES[min(hits)]
+        response["thoughts"] = list(thoughts)
+        response["answer"] = answer
+        response["actions"] = [{"type": action[0], "payload": {"id": action[1]}}]
 
     return response
 
-
-
-
-# Export Feature Dependencies
-import base64
-import io
-import os
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
-from supabase import create_client, Client
-
 # Initialize Supabase (Backend)
 # In a real scenario, these should be in .env
 SUPABASE_URL = os.getenv("SUPABASE_URL", "YOUR_SUPABASE_URL")
@@ -448,9 +623,11 @@ if SUPABASE_URL and "YOUR_" not in SUPABASE_URL:
     try:
         supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     except Exception as e:
-        print(f"Supabase Init Error: {e}")
+        log.error("Supabase Init Error: %s", e)
 
 class ExportRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     image_base64: str
     center: Dict[str, float]
     zoom: float
@@ -543,14 +720,14 @@ async def export_map(request: ExportRequest):
                      }).execute()
                      
             except Exception as e:
-                print(f"Supabase Upload Failed: {e}")
+                log.error("Supabase Upload Failed: %s", e)
                 # Fallback: Just return success without URL if storage fails (demo mode)
         
         if not public_url:
             # If no storage, we can't return a URL, but we can return bytes or a mock
             # For this demo, let's assume success even if storage fails 
             # (or return a data URI if we wanted to download directly, but requirements said upload)
-            print("Warning: PDF generated but not uploaded (Check Supabase credentials)")
+            log.warning("PDF generated but not uploaded (Check Supabase credentials)")
             public_url = "#"
 
         return {
@@ -561,11 +738,21 @@ async def export_map(request: ExportRequest):
         }
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Export failed")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("ENV") == "dev":
+        # Single process with the file watcher for local development.
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True,
+                    timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT)
+    else:
+        # One worker per core. "auto" picks uvloop + httptools (installed by uvicorn[standard])
+        # and falls back to asyncio/h11 where they are unavailable (uvloop has no Windows build).
+        uvicorn.run(
+            "main:app", host="0.0.0.0", port=8000,
+            workers=os.cpu_count(), loop="auto", http="auto",
+            reload=False, log_level="warning", timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT
+        )
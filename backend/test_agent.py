@@ -1,5 +1,5 @@
 import requests
-import json
+import orjson
 
 def test_agent(query: str):
     print(f"\n🧠 Prompting Agent: '{query}'")
@@ -8,9 +8,12 @@ def test_agent(query: str):
     
     try:
         response = requests.post(url, json=payload)
+        # The backend always sends UTF-8 JSON; naming it skips requests' charset sniffing
+        # if .text is ever read (e.g. in raise_for_status error paths).
+        response.encoding = "utf-8"
         response.raise_for_status()
         
-        result = response.json()
+        result = orjson.loads(response.content)
         print("💡 Agent Thoughts:")
         for thought in result['thoughts']:
              print(f"  - {thought}")
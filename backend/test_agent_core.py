@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+from google.genai import errors as genai_errors
+from agent.core import SatFusionAgent
+
+def _streaming_agent(chunks):
+    """
+    SatFusionAgent whose Gemini client streams `chunks` (offline, no API key needed).
+    An exception instance in `chunks` is raised at that point of the stream.
+    """
+    async def generate_content_stream(**kwargs):
+        async def stream():
+            for text in chunks:
+                if isinstance(text, Exception):
+                    raise text
+                yield SimpleNamespace(text=text)
+        return stream()
+
+    agent = SatFusionAgent()
+    agent.client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(
+        generate_content_stream=generate_content_stream)))
+    async def no_prompt_cache():
+        return None
+    agent._get_prompt_cache = no_prompt_cache
+    return agent
+
+def test_stream_stops_after_final_answer():
+    print("Testing early return on an inline Final Answer...")
+    agent = _streaming_agent([
+        "Thought: check floods\nFinal Answer: Flooding covers 40%.\n",
+        "Thought: this should never be read\n",
+    ])
+    output = asyncio.run(agent._call_llm("prompt"))
+    assert output == "Thought: check floods\nFinal Answer: Flooding covers 40%.", output
+    print("✅ Stream closed after the answer line")
+
+def test_stream_reads_answer_after_bare_label():
+    print("\nTesting Final Answer on the lines after the label...")
+    agent = _streaming_agent([
+        "Thought: check floods\nFinal Answer:\n",
+        "Flooding covers 40% of the district.\n",
+    ])
+    output = asyncio.run(agent._call_llm("prompt"))
+    assert output.endswith("Flooding covers 40% of the district.\n"), output
+    print("✅ Answer below a bare 'Final Answer:' label was kept")
+
+def test_llm_failure_uses_offline_fallback():
+    print("\nTesting offline fallback on LLM failures...")
+    for error in (TimeoutError("read timed out"), RuntimeError("unexpected transport failure")):
+        agent = _streaming_agent(["Thought: check floods\n", error])
+        result = asyncio.run(agent.reason_and_act("Assess flood damage in Assam"))
+        assert result["answer"].startswith("(Backup Mode)"), result["answer"]
+        assert len(agent.cache) == 0, "backup answers must not be cached"
+    print("✅ Timeouts and unclassified errors both end in Backup Mode")
+
+def test_cache_hits_are_scoped_and_rebuilt():
+    print("\nTesting agent answer cache...")
+    agent = _streaming_agent(["Final Answer: Flooding covers 40%.\n"])
+    agent.cache._model = False  # exact-match mode, as when sentence-transformers is missing
+    analyst = {"user_profile": {"name": "Asha", "role": "Hydrologist"}}
+    first = asyncio.run(agent.reason_and_act("Latest flood imagery over Chennai district", analyst))
+
+    repeat = asyncio.run(agent.reason_and_act("latest flood imagery over chennai district ", analyst))
+    assert repeat is not first and repeat["answer"] == first["answer"]
+    assert repeat["query"] == "latest flood imagery over chennai district "
+    assert repeat["thoughts"][0] == "Received query: 'latest flood imagery over chennai district '"
+
+    agent.client = None  # any further lookup that misses the cache goes to the offline fallback
+    other_city = asyncio.run(agent.reason_and_act("Latest flood imagery over Mumbai district", analyst))
+    other_user = asyncio.run(agent.reason_and_act("Latest flood imagery over Chennai district"))
+    assert other_city["answer"].startswith("(Backup Mode)"), other_city
+    assert other_user["answer"].startswith("(Backup Mode)"), other_user
+    print("✅ Hits carry their own query; other queries and profiles miss")
+
+def _caching_agent(errors):
+    """SatFusionAgent with caching switched on, whose caches.create raises each of `errors` in turn."""
+    calls = []
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise errors[len(calls) - 1]
+
+    agent = SatFusionAgent()
+    agent.client = SimpleNamespace(aio=SimpleNamespace(caches=SimpleNamespace(create=create)))
+    agent._prompt_cache_disabled = False
+    return agent, calls
+
+def test_prompt_cache_failures():
+    print("\nTesting context cache failure handling...")
+    assert SatFusionAgent()._prompt_cache_disabled, "directives are below the minimum cacheable size"
+
+    rejected = genai_errors.ClientError(400, {"error": {"code": 400, "message": "too small"}})
+    agent, calls = _caching_agent([ConnectionError("dns failure"), rejected])
+    assert asyncio.run(agent._get_prompt_cache()) is None
+    assert not agent._prompt_cache_disabled
+    assert asyncio.run(agent._get_prompt_cache()) is None and len(calls) == 1, "retry waits for the backoff"
+    agent._prompt_cache_retry_at = 0.0  # backoff elapsed
+    assert asyncio.run(agent._get_prompt_cache()) is None
+    assert agent._prompt_cache_disabled and len(calls) == 2
+    print("✅ Transient errors back off; a permanent 4xx disables the cache")
+
+if __name__ == "__main__":
+    test_stream_stops_after_final_answer()
+    test_stream_reads_answer_after_bare_label()
+    test_llm_failure_uses_offline_fallback()
+    test_cache_hits_are_scoped_and_rebuilt()
+    test_prompt_cache_failures()
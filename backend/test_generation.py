@@ -1,13 +1,12 @@
 import os
+import json
 import time
-from google import genai
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-client = genai.Client(api_key=api_key)
-
-print(f"Testing generation with API Key: {api_key[:10]}...")
+from verify_cache import CACHE_DIR
 
 models_to_test = [
     "gemini-2.0-flash",
@@ -16,16 +15,97 @@ models_to_test = [
     "gemini-2.5-flash",
 ]
 
-for model in models_to_test:
-    print(f"\nTesting {model}...")
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0 # seconds
+AUTH_ERROR_CODES = (401, 403)
+MODELS_CACHE_TTL = 3600 # seconds
+
+def available_models(client, api_key):
+    """
+    Model IDs the key can use, from one models.list() call.
+    Cached per key in .verify_cache/ for an hour so repeated runs skip the listing too.
+    """
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    path = os.path.join(CACHE_DIR, f"models-{key_hash}.json")
     try:
-        response = client.models.generate_content(
-            model=model,
-            contents="Say 'Hello'",
-            config={'temperature': 0.1}
-        )
-        print(f"✅ SUCCESS: {response.text}")
-    except Exception as e:
-        print(f"❌ FAILED: {e}")
-        # Wait a bit to avoid hitting rate limits immediately for the next one
-    time.sleep(2)
+        if time.time() - os.path.getmtime(path) < MODELS_CACHE_TTL:
+            with open(path, encoding="utf-8") as f:
+                return set(json.load(f))
+    except (OSError, ValueError):
+        pass
+    available = {m.name.split('/')[-1] for m in client.models.list()}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sorted(available), f)
+    return available
+
+def main():
+    # Imported here so the module can be imported (e.g. collected by pytest) without the SDK.
+    from google import genai
+    from google.genai import errors
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("❌ GOOGLE_API_KEY is not set.")
+        return
+    client = genai.Client(api_key=api_key)
+
+    print(f"Testing generation with API Key: {api_key[:10]}...")
+
+    # Only probe models the key is entitled to; if listing fails for another reason, probe them all.
+    try:
+        available = available_models(client, api_key)
+    except errors.APIError as e:
+        if e.code in AUTH_ERROR_CODES:
+            print(f"❌ API key was rejected ({e.code}); check GOOGLE_API_KEY.")
+            return
+        print(f"⚠️ Could not list models ({e}); probing all of them.")
+        available = set(models_to_test)
+    to_probe = [m for m in models_to_test if m in available]
+    for model in models_to_test:
+        if model not in available:
+            print(f"\n{model}: ⏭️ SKIPPED (not available for this key)")
+    if not to_probe:
+        return
+
+    # Set once any probe gets 401/403: the key is bad, so the other probes stop retrying.
+    auth_failed = threading.Event()
+
+    def probe(model):
+        # Only rate limits (429) are retried, with jittered exponential backoff.
+        for attempt in range(MAX_RETRIES + 1):
+            if auth_failed.is_set():
+                return None
+            try:
+                return client.models.generate_content(
+                    model=model,
+                    contents="Say 'Hello'",
+                    config={'temperature': 0.1}
+                )
+            except errors.APIError as e:
+                if e.code in AUTH_ERROR_CODES:
+                    auth_failed.set()
+                if e.code != 429 or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(BACKOFF_BASE * 2 ** attempt * (1 + random.random() * 0.5))
+
+    # All probes are in flight at once; results print as each model answers.
+    with ThreadPoolExecutor(max_workers=len(to_probe)) as ex:
+        futures = {ex.submit(probe, model): model for model in to_probe}
+        for future in as_completed(futures):
+            model = futures[future]
+            try:
+                response = future.result()
+                if response is None:
+                    print(f"\n{model}: ⏭️ SKIPPED (API key rejected)")
+                else:
+                    print(f"\n{model}: ✅ SUCCESS: {response.text}")
+            except Exception as e:
+                print(f"\n{model}: ❌ FAILED: {e}")
+
+    if auth_failed.is_set():
+        print("\n❌ API key was rejected (401/403); check GOOGLE_API_KEY.")
+
+if __name__ == "__main__":
+    main()
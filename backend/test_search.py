@@ -1,28 +1,35 @@
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
+from verify_cache import cached_post
+
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
 
 # New Delhi Bbox (approx)
 bbox = [77.10, 28.50, 77.30, 28.70] 
 
-payload = {
+payload = orjson.dumps({
     "source_id": "sentinel-2",
     "bbox": bbox,
     "start_date": "2024-01-01",
     "end_date": "2024-01-30"
-}
+})
 
 try:
     print("Testing Search API...")
-    res = requests.post("http://localhost:8000/search", json=payload)
-    print(f"Status: {res.status_code}")
-    if res.status_code == 200:
-        data = res.json()
+    status, body, cached = cached_post(SESSION, "http://localhost:8000/search", payload)
+    print(f"Status: {status}" + (" ✅ (cached)" if cached else ""))
+    if status == 200:
+        data = orjson.loads(body)
+        if data.get('error'):
+            print("Search Error:", data['error'])
         print(f"Count: {data.get('count')}")
         if data.get('results'):
-             print("First Result:", json.dumps(data['results'][0], indent=2))
+             print("First Result:", orjson.dumps(data['results'][0], option=orjson.OPT_INDENT_2).decode())
         else:
              print("Results is empty or None")
     else:
-        print("Error:", res.text)
+        print("Error:", body.decode(errors="replace"))
 except Exception as e:
     print("Exception:", str(e))
@@ -1,95 +1,138 @@
-import requests
-import json
-from datetime import datetime
+import importlib.util
+import logging
+import os
+import time
+import httpx
+import orjson
+import pytest
+import random
+import sys
+import verify_cache
 
-BASE_URL = "http://127.0.0.1:8000"
+# Live checks against a running backend. Run with `python verify_api.py`, or
+# `pytest -n 5 verify_api.py` (pytest-xdist) to probe every endpoint in parallel.
+# `python verify_api.py --health-body` (or VERIFY_HEALTH_BODY=1) checks /health with a full GET.
 
-def test_root():
-    print(f"Testing GET {BASE_URL}/ ...")
-    try:
-        response = requests.get(f"{BASE_URL}/")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        if response.status_code == 200:
-            print("✅ Root Endpoint Working")
-        else:
-            print("❌ Root Endpoint Failed")
-    except Exception as e:
-        print(f"❌ Connection Failed: {e}")
+log = logging.getLogger("verify")
 
-def test_health():
-    print(f"\nTesting GET {BASE_URL}/health ...")
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        if response.status_code == 200 and response.json().get("status") == "ok":
-            print("✅ Health Check Working")
-        else:
-            print("❌ Health Check Failed")
-    except Exception as e:
-        print(f"❌ Connection Failed: {e}")
+BASE_URL = os.getenv("VERIFY_BASE_URL", "http://127.0.0.1:8000")
+# HTTP/2 multiplexes all probes over one connection, but httpx only negotiates it over TLS
+# (ALPN) and needs the optional h2 package; the local uvicorn backend is plain HTTP/1.1.
+USE_HTTP2 = BASE_URL.startswith("https://") and importlib.util.find_spec("h2") is not None
+JSON_HEADERS = {"Content-Type": "application/json"}
+# An env var rather than a pytest option, so it needs no conftest and reaches xdist workers.
+HEALTH_BODY = os.getenv("VERIFY_HEALTH_BODY") == "1"
 
-def test_search():
-    print(f"\nTesting POST {BASE_URL}/search ...")
-    payload = {
+# Transient failures (server still starting, 5xx, rate limiting) are retried with
+# jittered exponential backoff before a probe fails.
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0 # seconds
+BACKOFF_CAP = 30.0 # seconds
+JITTER = 0.5
+
+def _backoff(attempt, retry_after=None):
+    delay = BACKOFF_BASE * 2 ** attempt
+    if retry_after is not None:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            pass # HTTP-date form; keep the exponential delay
+    return min(delay, BACKOFF_CAP) * (1 + JITTER * random.random())
+
+def _request_with_retry(client, method, url, **kwargs):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+        if (response.status_code == 429 or response.status_code >= 500) and attempt < MAX_RETRIES:
+            time.sleep(_backoff(attempt, response.headers.get("Retry-After")))
+            continue
+        return response
+
+def _json(response):
+    return orjson.loads(response.content) if response.content else {}
+
+@pytest.fixture(scope="session")
+def client():
+    """One keep-alive HTTP client per test session (per worker under pytest-xdist)."""
+    # /search waits on the STAC API, so allow more than httpx's 5 s default.
+    with httpx.Client(base_url=BASE_URL, http2=USE_HTTP2, timeout=60.0) as c:
+        yield c
+
+def test_root(client):
+    response = _request_with_retry(client, "GET", "/")
+    assert response.status_code == 200, response.text
+
+def test_health(client):
+    # Liveness only needs the status line; HEALTH_BODY does a full GET and checks the JSON.
+    if not HEALTH_BODY:
+        response = _request_with_retry(client, "HEAD", "/health")
+        assert response.status_code == 200
+        return
+    response = _request_with_retry(client, "GET", "/health")
+    assert response.status_code == 200, response.text
+    assert _json(response).get("status") == "ok"
+
+def test_search(client):
+    # Serialized once: the same bytes are sent on every retry and hashed for the cache key.
+    payload = orjson.dumps({
         "source_id": "sentinel-2",
         "bbox": [77.1, 28.5, 77.3, 28.7],
         "start_date": "2024-01-01T00:00:00Z",
         "end_date": "2024-01-10T00:00:00Z"
-    }
-    try:
-        response = requests.post(f"{BASE_URL}/search", json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        if response.status_code == 200:
-            print("✅ Search Endpoint Working")
-        else:
-            print(f"❌ Search Endpoint Failed: {response.text}")
-    except Exception as e:
-        print(f"❌ Connection Failed: {e}")
+    })
+    def fetch():
+        response = _request_with_retry(client, "POST", "/search", content=payload, headers=JSON_HEADERS)
+        return response.status_code, response.content
 
-def test_fuse_pan_sharpen():
-    print(f"\nTesting POST {BASE_URL}/fuse (Pan-Sharpen) ...")
-    payload = {
-        "method": "pan-sharpen",
-        "optical_source_id": "sentinel-2",
-        "secondary_source_id": "liss-4"  # Arbitrary for now as it's mocked
-    }
-    try:
-        response = requests.post(f"{BASE_URL}/fuse", json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        if response.status_code == 200 and response.json().get("status") == "success":
-            print("✅ Fuse (Pan-Sharpen) Working")
-        else:
-            print(f"❌ Fuse (Pan-Sharpen) Failed: {response.text}")
-    except Exception as e:
-        print(f"❌ Connection Failed: {e}")
+    # Served from the local cache when the same search ran in the last 10 minutes.
+    status, body, cached = verify_cache.get_or_set(verify_cache.cache_key(f"{BASE_URL}/search", payload), fetch)
+    if cached:
+        log.info("✅ (cached) /search served from %s", verify_cache.CACHE_DIR)
+    response = httpx.Response(status, content=body)
+    assert response.status_code == 200, response.text
+    body = _json(response)
+    # A failed STAC query still answers 200, with the reason under "error".
+    assert "error" not in body, body.get("error")
+    assert "results" in body
 
-def test_fuse_sar_optical():
-    print(f"\nTesting POST {BASE_URL}/fuse (SAR-Optical) ...")
-    payload = {
-        "method": "sar-optical",
+# secondary source is arbitrary for pan-sharpen as the fusion is mocked
+@pytest.mark.parametrize("method, secondary_source_id", [
+    ("pan-sharpen", "liss-4"),
+    ("sar-optical", "sentinel-1"),
+])
+def test_fuse(client, method, secondary_source_id):
+    payload = orjson.dumps({
+        "method": method,
         "optical_source_id": "sentinel-2",
-        "secondary_source_id": "sentinel-1"
-    }
-    try:
-        response = requests.post(f"{BASE_URL}/fuse", json=payload)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.json()}")
-        if response.status_code == 200 and response.json().get("status") == "success":
-            print("✅ Fuse (SAR-Optical) Working")
-        else:
-            print(f"❌ Fuse (SAR-Optical) Failed: {response.text}")
-    except Exception as e:
-        print(f"❌ Connection Failed: {e}")
+        "secondary_source_id": secondary_source_id
+    })
+    response = _request_with_retry(client, "POST", "/fuse", content=payload, headers=JSON_HEADERS)
+    assert response.status_code == 200, response.text
+    assert _json(response).get("status") == "success"
+
+def test_fuse_batch(client):
+    # Both fusion methods in a single request.
+    payload = orjson.dumps({"jobs": [
+        {"method": "pan-sharpen", "optical_source_id": "sentinel-2", "secondary_source_id": "liss-4"},
+        {"method": "sar-optical", "optical_source_id": "sentinel-2", "secondary_source_id": "sentinel-1"},
+    ]})
+    response = _request_with_retry(client, "POST", "/fuse/batch", content=payload, headers=JSON_HEADERS)
+    assert response.status_code == 200, response.text
+    results = _json(response)["results"]
+    assert [r.get("status") for r in results] == ["success", "success"]
 
 if __name__ == "__main__":
-    print("Starting Backend API Verification...")
-    test_root()
-    test_health()
-    test_search()
-    test_fuse_pan_sharpen()
-    test_fuse_sar_optical()
-    print("\nVerification Complete.")
+    if "--health-body" in sys.argv[1:]:
+        os.environ["VERIFY_HEALTH_BODY"] = "1"
+    args = ["-v", __file__]
+    if importlib.util.find_spec("xdist") is not None:
+        args[:0] = ["-n", "5"]
+    else:
+        # Live log lines (cache hits) on the console; xdist workers report theirs per test instead.
+        args[:0] = ["--log-cli-level=INFO"]
+    raise SystemExit(pytest.main(args))
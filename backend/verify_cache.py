@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import shelve
+import hashlib
+
+# Local response cache for the verification scripts: re-running them in a dev loop
+# shouldn't re-run the full STAC search server-side every time.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".verify_cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "responses")
+DEFAULT_TTL = 600 # seconds
+
+def cache_key(url, payload_bytes):
+    # Hash of the URL plus the exact request body bytes that go on the wire.
+    return hashlib.sha256(url.encode() + b"\n" + payload_bytes).hexdigest()
+
+def _open():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return shelve.open(CACHE_PATH)
+
+def get(key, ttl=DEFAULT_TTL):
+    """Returns the stored (status, body) for `key` if younger than `ttl` seconds, else None."""
+    with _open() as cache:
+        entry = cache.get(key)
+    if entry is None:
+        return None
+    stored_at, status, body = entry
+    if time.time() - stored_at >= ttl:
+        return None
+    return status, body
+
+def put(key, status, body):
+    with _open() as cache:
+        cache[key] = (time.time(), status, body)
+
+def is_success(status, body):
+    """
+    200 with a JSON body that carries no "error" key. /search reports a failed STAC query
+    as 200 + {"error": ...}, and such a reply must not be replayed from the cache.
+    """
+    if status != 200:
+        return False
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+    return not (isinstance(data, dict) and "error" in data)
+
+def get_or_set(key, fetch, ttl=DEFAULT_TTL, cacheable=is_success):
+    """
+    Returns (status, body, cached). On a miss, calls `fetch()` -> (status, body) and
+    stores the result if `cacheable(status, body)` holds.
+    """
+    hit = get(key, ttl)
+    if hit is not None:
+        return hit + (True,)
+    status, body = fetch()
+    if cacheable(status, body):
+        put(key, status, body)
+    return status, body, False
+
+def cached_post(session, url, payload_bytes, ttl=DEFAULT_TTL, cacheable=is_success):
+    """
+    POSTs the pre-serialized JSON `payload_bytes` through a requests.Session unless a
+    fresh response is cached. Returns (status_code, body bytes, cached).
+    """
+    def fetch():
+        response = session.post(url, data=payload_bytes, headers={"Content-Type": "application/json"})
+        return response.status_code, response.content
+    return get_or_set(cache_key(url, payload_bytes), fetch, ttl, cacheable)
@@ -203,31 +203,29 @@ export default function Index() {
     }
   };
 
-  // Phase 3: Live Pulse Polling (Real-Time Satellite Feed Simulation)
+  // Phase 3: Live Pulse Feed (Real-Time Satellite Feed Simulation)
+  // Server-Sent Events: the backend pushes an event only when a new pass happens.
   useEffect(() => {
-    const pollInterval = setInterval(() => {
-      fetch('http://localhost:8000/notifications/live')
-        .then(res => res.json())
-        .then(data => {
-          if (data.has_new && data.event) {
-            // Play Notification Sound (Optional)
-            // const audio = new Audio('/ping.mp3'); audio.play().catch(e=>{});
-
-            // Show Toast
-            toast({
-              title: "New Satellite Pass",
-              description: data.event.message,
-              duration: 5000,
-            });
+    const feed = new EventSource('http://localhost:8000/notifications/stream');
+    feed.onmessage = (e) => {
+      const event = JSON.parse(e.data);
 
-            // Log to Terminal
-            addLog(`LIVE FEED: ${data.event.message}`, 'info');
-          }
-        })
-        .catch(console.error);
-    }, 15000); // Check every 15 seconds
+      // Play Notification Sound (Optional)
+      // const audio = new Audio('/ping.mp3'); audio.play().catch(e=>{});
+
+      // Show Toast
+      toast({
+        title: "New Satellite Pass",
+        description: event.message,
+        duration: 5000,
+      });
+
+      // Log to Terminal
+      addLog(`LIVE FEED: ${event.message}`, 'info');
+    };
+    feed.onerror = console.error;
 
-    return () => clearInterval(pollInterval);
+    return () => feed.close();
   }, []);
 
   const toggleFusionOption = async (id: string) => {